@@ -0,0 +1,125 @@
+import pygame
+from settings import resource_path
+
+# Process-wide cache of decoded images and sliced animation frames.
+# Entries are shared between sprites: treat returned surfaces as read-only.
+_images = {}
+_frames = {}
+_stats = {"hits": 0, "misses": 0, "bytes": 0}
+
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _keep_sheet(path, sheet):
+    """Keep a decoded sheet resident while unscaled frames are subsurfaces of it."""
+    if path not in _images:
+        _images[path] = sheet
+        _stats["bytes"] += _surface_bytes(sheet)
+
+
+def load_image(path, size=None):
+    """Return a whole image, optionally scaled to `size`."""
+    return load_frames(path, 1, None, size=size)[0]
+
+
+def load_frames(path, count, frame_size, spacing=0, size=None):
+    """Slice `count` frames laid out horizontally in a sprite sheet.
+
+    frame_size: (w, h) of one frame in the sheet, or None for the whole image.
+    spacing:    gap in pixels between frames.
+    size:       optional (w, h) every frame is scaled to.
+
+    Returns a tuple of surfaces shared by all callers with the same key.
+    """
+    key = (path, count, frame_size, spacing, size)
+    frames = _frames.get(key)
+    if frames is not None:
+        _stats["hits"] += 1
+        return frames
+    _stats["misses"] += 1
+
+    sheet = _images.get(path)
+    if sheet is None:
+        sheet = pygame.image.load(resource_path(path)).convert_alpha()
+    if frame_size is None:
+        frame_size = sheet.get_size()
+    f_w, f_h = frame_size
+
+    result = []
+    for i in range(count):
+        frame = sheet.subsurface((i * (f_w + spacing), 0, f_w, f_h))
+        if size is not None and size != (f_w, f_h):
+            frame = pygame.transform.scale(frame, size)
+            _stats["bytes"] += _surface_bytes(frame)
+        else:
+            _keep_sheet(path, sheet)
+        result.append(frame)
+
+    frames = tuple(result)
+    _frames[key] = frames
+    return frames
+
+
+def cache_stats():
+    """Returns hit/miss counts, cached entries and resident pixel bytes."""
+    return {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "entries": len(_frames) + len(_banks),
+        "bytes": _stats["bytes"],
+    }
+
+
+def clear_cache():
+    _images.clear()
+    _frames.clear()
+    _banks.clear()
+    _stats.update(hits=0, misses=0, bytes=0)
+
+
+# --- Animation frame banks ---
+# Every (state, facing, effect variant) combination is baked once at load, so
+# animating is an index lookup and effects never touch the shared source frames.
+_banks = {}
+
+VARIANTS = {
+    "normal": None,
+    "shield": ((255, 255, 255, 150), pygame.BLEND_RGBA_MULT),  # Semi-transparent
+    "flash": ((180, 180, 180, 0), pygame.BLEND_RGB_ADD),        # Hit flash (whitened)
+}
+
+
+def _bake_variant(frame, variant):
+    tint = VARIANTS[variant]
+    if tint is None:
+        return frame
+    frame = frame.copy()
+    frame.fill(tint[0], special_flags=tint[1])
+    return frame
+
+
+def load_frame_bank(animations, variants=("normal",)):
+    """Build {(state, facing_right, variant): frames} from {state: frames}.
+
+    Left-facing frames are mirrored copies. Banks are cached on the source
+    frames, so sprites built from the same sheets share one bank.
+    """
+    key = (tuple((state, tuple(frames)) for state, frames in sorted(animations.items())), tuple(variants))
+    bank = _banks.get(key)
+    if bank is not None:
+        _stats["hits"] += 1
+        return bank
+    _stats["misses"] += 1
+
+    bank = {}
+    for state, frames in animations.items():
+        for facing_right in (True, False):
+            oriented = frames if facing_right else [pygame.transform.flip(f, True, False) for f in frames]
+            for variant in variants:
+                baked = tuple(_bake_variant(f, variant) for f in oriented)
+                bank[(state, facing_right, variant)] = baked
+                _stats["bytes"] += sum(_surface_bytes(f) for f in baked if f not in frames)
+    _banks[key] = bank
+    return bank
@@ -0,0 +1,29 @@
+import pygame
+
+
+class Camera:
+    """Viewport into the world. Keeps the target centred, clamped to the map."""
+
+    def __init__(self, view_w, view_h, world_w, world_h):
+        self.view_rect = pygame.Rect(0, 0, view_w, view_h)
+        self.world_w = world_w
+        self.world_h = world_h
+
+    @property
+    def offset(self):
+        return self.view_rect.topleft
+
+    def follow(self, target_rect):
+        view = self.view_rect
+        x = target_rect.centerx - view.w // 2
+        y = target_rect.centery - view.h // 2
+        # Clamp to map bounds (maps smaller than the screen stay at 0)
+        view.x = max(0, min(x, self.world_w - view.w))
+        view.y = max(0, min(y, self.world_h - view.h))
+
+    def apply(self, rect):
+        """World rect -> screen rect."""
+        return rect.move(-self.view_rect.x, -self.view_rect.y)
+
+    def apply_point(self, point):
+        return point[0] - self.view_rect.x, point[1] - self.view_rect.y
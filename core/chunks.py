@@ -0,0 +1,63 @@
+import pygame
+from collections import OrderedDict
+from settings import CHUNK_TILES, CHUNK_CACHE_BUDGET
+
+
+class ChunkedMapRenderer:
+    """Renders a TiledMap in fixed-size chunks on demand.
+
+    Only chunks intersecting the viewport are baked and blitted. Baked chunks
+    live in an LRU bounded by CHUNK_CACHE_BUDGET bytes, so map size no longer
+    decides how much memory the map image takes.
+    """
+
+    def __init__(self, tiled_map, chunk_tiles=CHUNK_TILES, budget=CHUNK_CACHE_BUDGET):
+        self.map = tiled_map
+        self.tile_w = tiled_map.tile_w
+        self.tile_h = tiled_map.tile_h
+        self.chunk_w = chunk_tiles * self.tile_w
+        self.chunk_h = chunk_tiles * self.tile_h
+        self.cols = -(-tiled_map.width // self.chunk_w)
+        self.rows = -(-tiled_map.height // self.chunk_h)
+        self.budget = budget
+
+        self.chunks = OrderedDict()
+        self.resident_bytes = 0
+
+    def chunk_rect(self, cx, cy):
+        rect = pygame.Rect(cx * self.chunk_w, cy * self.chunk_h, self.chunk_w, self.chunk_h)
+        return rect.clip(pygame.Rect(0, 0, self.map.width, self.map.height))
+
+    def _get_chunk(self, cx, cy):
+        key = (cx, cy)
+        surf = self.chunks.get(key)
+        if surf is not None:
+            self.chunks.move_to_end(key)
+            return surf
+
+        surf = self.map.render_area(self.chunk_rect(cx, cy))
+        size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+        self.chunks[key] = surf
+        self.resident_bytes += size
+        # Evict least recently seen chunks, but never the one just baked
+        while self.resident_bytes > self.budget and len(self.chunks) > 1:
+            _, old = self.chunks.popitem(last=False)
+            self.resident_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def draw(self, surface, camera):
+        """Blit the chunks visible through `camera` (and the surface clip)."""
+        view = camera.view_rect
+        clip = surface.get_clip()
+        area = view.clip(clip.move(view.x, view.y))
+        if not area.w or not area.h:
+            return
+        x0, x1 = area.left // self.chunk_w, (area.right - 1) // self.chunk_w
+        y0, y1 = area.top // self.chunk_h, (area.bottom - 1) // self.chunk_h
+        for cy in range(max(0, y0), min(self.rows - 1, y1) + 1):
+            for cx in range(max(0, x0), min(self.cols - 1, x1) + 1):
+                surface.blit(self._get_chunk(cx, cy),
+                             (cx * self.chunk_w - view.x, cy * self.chunk_h - view.y))
+
+    def stats(self):
+        return len(self.chunks), self.cols * self.rows, self.resident_bytes
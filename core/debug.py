@@ -1,32 +1,129 @@
 import pygame
+from core import text
+
+STATS_FONT = ("Consolas", 16, False)
+
+# Stacked groups in the frame-time graph, and per-scope bar colours
+GRAPH_GROUPS = (
+    (("input", "physics", "collision", "triggers", "animation"), (80, 220, 120)),
+    (("map", "sprites", "lights", "hud"), (90, 150, 255)),
+    (("present",), (200, 200, 200)),
+)
+
+
+def _stats_text(line):
+    """Render one overlay line, bypassing the shared text LRU.
+
+    Overlay lines change every frame (timings, counters); caching them would
+    only evict the HUD and menu strings the LRU is there for.
+    """
+    return text.get_font(STATS_FONT).render(line, True, (0, 255, 0))
+
 
 class Debugger:
+
+    @staticmethod
+    def draw_stats(screen, lines, pos=(10, 10)):
+        """Draw a stack of debug text lines on a dark backing. Returns the area covered."""
+        x, y = pos
+        area = pygame.Rect(x, y, 0, 0)
+        for line in lines:
+            surf = _stats_text(line)
+            bg = surf.get_rect(topleft=(x, y)).inflate(6, 2)
+            pygame.draw.rect(screen, (0, 0, 0), bg)
+            screen.blit(surf, (x, y))
+            area.union_ip(bg)
+            y += surf.get_height() + 2
+        return area
+
     @staticmethod
-    def draw_hitboxes(screen, player, enemies, props_group, dest_group, map_handler):
+    def _outline(screen, color, rect, width):
+        """Rect outline drawn as filled edges.
+
+        pygame.draw.rect thickens outlines that cross the screen clip, which
+        breaks dirty-rect redraws; fill() clips exactly.
+        """
+        r = pygame.Rect(rect)
+        screen.fill(color, (r.left, r.top, r.w, width))
+        screen.fill(color, (r.left, r.bottom - width, r.w, width))
+        screen.fill(color, (r.left, r.top, width, r.h))
+        screen.fill(color, (r.right - width, r.top, width, r.h))
+
+    @staticmethod
+    def draw_hitboxes(screen, player, enemies, props_group, dest_group, map_handler, camera=None):
+        # World -> screen offset
+        ox, oy = camera.offset if camera else (0, 0)
+        def outline(color, rect, width):
+            Debugger._outline(screen, color, pygame.Rect(rect).move(-ox, -oy), width)
+
         # 1. Player (Green)
         if player:
-            pygame.draw.rect(screen, (0, 255, 0), player.rect, 2)
+            outline((0, 255, 0), player.rect, 2)
         
         # 2. Enemies (Red)
         for e in enemies:
-            pygame.draw.rect(screen, (255, 0, 0), e.rect, 2)
+            outline((255, 0, 0), e.rect, 2)
         
         # 3. Props (Yellow)
         for p in props_group:
-            pygame.draw.rect(screen, (255, 255, 0), p.rect, 2)
+            outline((255, 255, 0), p.rect, 2)
         
         # 4. Destination (Cyan)
         for d in dest_group:
-            pygame.draw.rect(screen, (0, 255, 255), d.rect, 2)
+            outline((0, 255, 255), d.rect, 2)
 
         # 5. Walls (Pink)
         for wall in map_handler.walls:
-            pygame.draw.rect(screen, (200, 100, 200), wall, 1)
+            outline((200, 100, 200), wall, 1)
         
         # 6. Hazards (Orange)
         for hazard in map_handler.hazards:
-            pygame.draw.rect(screen, (255, 165, 0), hazard, 1)
+            outline((255, 165, 0), hazard, 1)
 
         # 7. Bouncers (Blue)
         for bouncer in map_handler.bouncers:
-            pygame.draw.rect(screen, (0, 0, 255), bouncer, 1)
\ No newline at end of file
+            outline((0, 0, 255), bouncer, 1)
+
+    @staticmethod
+    def draw_profile(screen, profiler, rect, budget_ms):
+        """Frame-time graph (one column per frame) and per-scope bars averaged over the last frames."""
+        rect = pygame.Rect(rect)
+        screen.fill((0, 0, 0), rect)
+        history = profiler.history()
+        if not len(history):
+            return rect
+        ms = history * 1000
+        index = {name: i for i, name in enumerate(profiler.scopes)}
+
+        # Graph: stacked update / render / present per frame, 2x budget tall
+        graph = pygame.Rect(rect.x + 4, rect.y + 4, rect.w - 8, 60)
+        scale = graph.h / (2 * budget_ms)
+        columns = ms[-graph.w:]
+        x = graph.right - len(columns)
+        for row in columns.tolist():
+            bottom = graph.bottom
+            for names, color in GRAPH_GROUPS:
+                h = min(bottom - graph.top, int(sum(row[index[n]] for n in names) * scale + 0.5))
+                if h > 0:
+                    screen.fill(color, (x, bottom - h, 1, h))
+                    bottom -= h
+            x += 1
+        budget_y = graph.bottom - int(budget_ms * scale)
+        screen.fill((255, 80, 80), (graph.x, budget_y, graph.w, 1))
+
+        # Bars: mean of the last 60 frames per scope
+        mean = ms[-60:].mean(axis=0)
+        y = graph.bottom + 6
+        bar_x = rect.x + 150
+        bar_scale = (rect.right - 4 - bar_x) / budget_ms
+        for name in profiler.scopes:
+            value = mean[index[name]]
+            label = _stats_text(f"{name:<9} {value:6.3f}")
+            screen.blit(label, (rect.x + 4, y))
+            width = min(rect.right - 4 - bar_x, int(value * bar_scale + 0.5))
+            if width > 0:
+                screen.fill((0, 200, 0), (bar_x, y + 4, width, 8))
+            y += 16
+        frame = _stats_text(f"frame     {mean[-1]:6.3f} ms (F2: dump)")
+        screen.blit(frame, (rect.x + 4, y))
+        return rect
@@ -0,0 +1,493 @@
+import os
+import numpy as np
+import pygame
+import settings
+from settings import (WIDTH, HEIGHT, FPS, RENDER_FPS, PLAYER_LIGHT_RADIUS, DIRTY_RECT_RENDERING,
+                      EFFECT_PARTICLES, SHADOWS_ENABLED, ENEMY_STEPS_PER_FRAME)
+from core.maploader import TiledMap
+from core.preloader import level_file
+from core.light_manager import LightManager
+from core.debug import Debugger
+from core.profiler import Profiler
+from core.renderer import DirtyRenderer
+from core.camera import Camera
+from core.assets import cache_stats
+from core import text, level_data
+from core.inputs import RESET
+from core.scheduler import Scheduler, PHASES, INPUT, PHYSICS, COLLISION, TRIGGERS, ANIMATION
+from core.particles import ParticleSystem, fade_strip
+from sprites.player import Player
+from sprites.enemy import Enemy, EnemyManager, CHASE
+from sprites.prop import Prop
+from sprites.dest import Destination
+
+CLEAR_FONT = ("Arial", 64, True)
+HUD_FONT = ("Consolas", 24, True)
+
+# Debug profiler panel (bottom left)
+PROFILE_PANEL = pygame.Rect(10, HEIGHT - 262, 320, 252)
+
+# Effect particle kinds (index into the strips built in Game.__init__)
+FX_EXPLOSION = 0
+FX_PICKUP = 1
+
+
+def init_headless():
+    """Boot pygame on the SDL dummy driver (no window, no rendering).
+
+    Sprites still need a display mode for convert_alpha(), so a 1x1 one is set.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode((1, 1))
+
+
+class Game:
+    """Level simulation core: owns the map, sprite groups and timers.
+
+    `step(inputs)` advances exactly one fixed step (1 / FPS s) and never
+    touches the display, so it can run headless as fast as the CPU allows.
+    `render(surface, alpha=...)` draws the current state and is only called
+    by the windowed loop, which may render at a different rate than it steps.
+    """
+
+    def __init__(self):
+        self.map_handler = None
+        self.camera = None
+        self.level_id = None
+        self.level_data = None  # LevelData record of the loaded level
+        self.death_count = 0
+        self.debug = settings.DEBUG_MODE
+
+        self.all_sprites = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.props_group = pygame.sprite.Group()
+        self.dest_group = pygame.sprite.Group()
+
+        self.player = None
+        self.enemy_manager = EnemyManager()
+        self.chasers = []  # Chasing enemies step on their own (path following)
+        self.shield_timer = 0
+        self.torch_timer = 0
+        self.has_anti_explosion = False
+        self.lv_cleared = False
+        self.frame = 0
+        self.prev_pos = {}  # Sprite -> copy of its rect before the last step (render interpolation)
+        self.spawn_state = None  # Entity state right after load (see _snapshot)
+
+        # Visual-only effects; seeded so replays look the same
+        self.effects = ParticleSystem([fade_strip(6, (255, 140, 40), 8), fade_strip(4, (255, 240, 140), 8)],
+                                      EFFECT_PARTICLES, gravity=0.15)
+        self.effects_rng = np.random.default_rng(0)
+
+        # Per-frame systems, each run once in its phase
+        self.inputs = 0
+        self.scheduler = self._build_scheduler()
+        # Wall-clock cost of each phase in the last step (seconds)
+        self.timings = self.scheduler.timings
+        # Timing scopes + history for the debug overlay; free while debug is off
+        self.profiler = Profiler()
+        self.profiler.enabled = self.debug
+        self.profile_surf = None
+
+        # View radius
+        self.base_radius = PLAYER_LIGHT_RADIUS
+        self.current_radius = self.base_radius
+        self.target_radius = self.base_radius
+        self.lerp_speed = 0.08
+
+        # Render-only resources, created on first render()
+        self.light_manager = None
+        self.renderer = None
+        self.hud_deaths = None  # Death count the HUD surface was rendered for
+        self.frozen_key = None  # Scene of the kept level-cleared frame
+        self.debug_rect = pygame.Rect(0, 0, 0, 0)
+
+    def _build_scheduler(self):
+        s = Scheduler()
+        walls = lambda: self.map_handler.wall_index
+        s.add(INPUT, "timers", self._update_timers)
+        s.add(INPUT, "player_input", lambda: self.player._get_input(self.inputs), ("player",))
+        s.add(PHYSICS, "player_move", lambda: self.player.move(walls()), ("player",))
+        s.add(PHYSICS, "enemy_move", self._move_enemies, ("enemies",))
+        s.add(COLLISION, "player_world", lambda: self.player.check_world(
+            self.map_handler.hazard_index, self.map_handler.bouncer_index, self.shield_timer), ("player",))
+        s.add(TRIGGERS, "interactions", self._resolve_collisions,
+              ("player", "dest_group", "props_group", "enemies"))
+        s.add(ANIMATION, "player_anim", lambda: self.player.animate(self.shield_timer), ("player",))
+        s.add(ANIMATION, "effects", self.effects.update, ("effects",))
+        return s
+
+    def _move_enemies(self):
+        walls = self.map_handler.wall_index
+        for _ in range(ENEMY_STEPS_PER_FRAME):
+            self.enemy_manager.update(walls)
+            for enemy in self.chasers:
+                enemy.update(walls)
+
+    def load_level(self, lv_num, tiled_map=None):
+        """Load level by number. Returns True on success.
+
+        tiled_map: an already built map for this level (e.g. from the preloader).
+        """
+        tmx_file = level_file(lv_num)
+        level_id = f"lv{lv_num}"
+        try:
+            # Spawns/enemies/props: parsed once, re-read only if lvsetting.json changed
+            self.level_data = level_data.get(level_id)
+            self.map_handler = tiled_map or TiledMap(tmx_file)
+        except Exception as e:
+            print(f"Load failed: {e}")
+            return False
+        settings.TMX_FILE = tmx_file
+        self.level_id = level_id
+        self.camera = Camera(WIDTH, HEIGHT, self.map_handler.width, self.map_handler.height)
+        self._spawn()
+        self.spawn_state = self._snapshot()
+        self.reset()
+        return True
+
+    def reset(self):
+        """Put the level back as it was right after load_level().
+
+        Entities are the ones _spawn() created, restored in place from the
+        load-time snapshot: no sprites, surfaces or file reads per respawn.
+        """
+        self.lv_cleared = False
+        self.shield_timer = 0
+        self.torch_timer = 0
+        self.has_anti_explosion = False
+        self.current_radius = self.base_radius
+        self.target_radius = self.base_radius
+        self.effects.clear()
+        self._restore(self.spawn_state)
+        print(f"--- {self.level_id} Reset Complete ---")
+
+    def _spawn(self):
+        """Create the level's entities from its level data (once per load)."""
+        # Clear groups
+        self.all_sprites.empty()
+        self.enemies.empty()
+        self.props_group.empty()
+        self.dest_group.empty()
+
+        # Level data was validated on load: no file access here
+        lv = self.level_data
+
+        # 1. Destination
+        if lv.destination:
+            goal = Destination(lv.destination[0], lv.destination[1])
+            self.dest_group.add(goal)
+            self.all_sprites.add(goal)
+
+        # 2. Player
+        self.player = Player(lv.player_spawn[0], lv.player_spawn[1])
+        self.all_sprites.add(self.player)
+
+        # 3. Enemies (patrols stepped together by the manager, chasers on their own)
+        self.enemy_manager = EnemyManager()
+        self.chasers = []
+        for e in lv.enemies:
+            new_enemy = Enemy(e.start_pos[0], e.start_pos[1], e.move_range, e.speed, e.behavior)
+            self.enemies.add(new_enemy)
+            self.all_sprites.add(new_enemy)
+            if e.behavior == CHASE:
+                new_enemy.chase(self.map_handler.nav_graph(e.speed), self.player.rect)
+                self.chasers.append(new_enemy)
+            else:
+                self.enemy_manager.add(new_enemy)
+
+        # 4. Props
+        for p in lv.props:
+            new_prop = Prop(p.pos[0], p.pos[1], p.type)
+            self.props_group.add(new_prop)
+            self.all_sprites.add(new_prop)
+
+        # Position buffers, updated in place by step() and _restore()
+        self.prev_pos = {sprite: sprite.rect.copy() for sprite in self.all_sprites}
+
+    def _snapshot(self):
+        """Entity state to respawn from, taken once per load.
+
+        Group members in draw order (the alive flags), player and enemy
+        positions, velocities and timers, and the enemy manager's arrays.
+        """
+        groups = tuple((group, tuple(group)) for group in
+                       (self.all_sprites, self.enemies, self.props_group, self.dest_group))
+        movers = tuple((sprite, sprite.snapshot()) for sprite in (self.player, *self.enemies))
+        return groups, movers, self.enemy_manager.snapshot()
+
+    def _restore(self, state):
+        groups, movers, manager = state
+        for group, members in groups:
+            # Groups only ever lose sprites (props picked up): put back just those
+            if len(group.spritedict) != len(members):
+                for sprite in members:
+                    if not group.has(sprite):
+                        group.add(sprite)
+        for sprite, saved in movers:
+            sprite.restore(saved)
+        self.enemy_manager.restore(manager)
+        # Nothing to interpolate from: the old positions would slide towards the spawn points
+        self._keep_positions()
+
+    def _keep_positions(self):
+        """Copy every sprite's rect into its prev_pos buffer."""
+        for sprite, prev in self.prev_pos.items():
+            prev.update(sprite.rect)
+
+    def _die(self):
+        self.death_count += 1
+        self.reset()
+        self.scheduler.halt()  # The rest of this frame belonged to the old run
+
+    def handle_event(self, event):
+        """Handle in-level keys. Returns "MENU", "PAUSE", "RESET" or None.
+
+        A reset is not applied here: the caller folds it into the next
+        step's input mask so recordings capture it.
+        """
+        if event.type != pygame.KEYDOWN:
+            return None
+        # Return to menu after clear
+        if self.lv_cleared and event.key == pygame.K_RETURN:
+            return "MENU"
+        # Manual reset
+        if event.key == pygame.K_r:
+            return "RESET"
+        # Toggle debug
+        if event.key == pygame.K_m:
+            self.debug = not self.debug
+            self.profiler.enabled = self.debug
+            print(f"Debug Mode: {'ON' if self.debug else 'OFF'}")
+        # Dump profiler history
+        if event.key == pygame.K_F2 and self.debug:
+            print("Profile written to {} and {}".format(*self.profiler.dump()))
+        # Pause
+        if event.key == pygame.K_ESCAPE and not self.lv_cleared:
+            return "PAUSE"
+        return None
+
+    def step(self, inputs):
+        """Advance the simulation by one frame using an input bitmask."""
+        if inputs & RESET:
+            self._die()
+        if self.lv_cleared:
+            return
+        self.frame += 1
+        self.inputs = inputs
+        self._keep_positions()
+        self.map_handler.reset_broadphase_stats()
+        self.scheduler.run()
+        if self.profiler.enabled:
+            for phase in PHASES:
+                self.profiler.add(phase, self.timings[phase])
+
+    def _update_timers(self):
+        # Timers & Radius Lerp
+        if self.shield_timer > 0: self.shield_timer -= 1
+        if self.torch_timer > 0:
+            self.torch_timer -= 1
+            self.target_radius = self.base_radius * 5
+        else:
+            self.target_radius = self.base_radius
+
+        self.current_radius += (self.target_radius - self.current_radius) * self.lerp_speed
+
+    def _resolve_collisions(self):
+        player = self.player
+        if player.is_dead:
+            self._die()
+            return
+
+        if pygame.sprite.spritecollideany(player, self.dest_group):
+            self.lv_cleared = True
+
+        # Prop collisions
+        p_hits = pygame.sprite.spritecollide(player, self.props_group, True)
+        for p in p_hits:
+            self.effects.burst(p.rect.center, 24, 3.0, self.effects_rng, FX_PICKUP, life=40)
+            if p.prop_type == 1: player.vel.y = -12.0
+            elif p.prop_type == 2: self.has_anti_explosion = True
+            elif p.prop_type == 3: self.shield_timer = 5 * FPS
+            elif p.prop_type == 4: self.torch_timer = 2 * FPS
+
+        # Enemy collisions
+        e_hits = pygame.sprite.spritecollide(player, self.enemies, False)
+        if e_hits:
+            should_die = True
+            for e in e_hits:
+                if self.shield_timer > 0 or self.has_anti_explosion:
+                    self.effects.burst(e.rect.center, 64, 5.0, self.effects_rng, FX_EXPLOSION, life=45)
+                    if hasattr(e, 'explode'): e.explode()
+                    else: e.kill()
+                    self.has_anti_explosion = False
+                    should_die = False
+            if should_die:
+                self._die()
+
+    def render(self, screen, hud=True, alpha=1.0):
+        """Draw the current frame. Pass hud=False for the bare world (pause backdrop).
+
+        alpha: how far real time is between the previous step and the last
+        one (FixedTimestep.alpha); sprites are drawn that far along, so
+        motion stays smooth when render and step rates differ. 1.0 draws the
+        simulation state as is.
+
+        Returns the rects that changed for pygame.display.update(), or None
+        when the whole screen was redrawn and the caller should flip().
+        """
+        if self.light_manager is None:
+            self.light_manager = LightManager(self.base_radius)
+            self.clear_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            self.clear_overlay.fill((0, 0, 0, 180))
+            self.renderer = DirtyRenderer() if DIRTY_RECT_RENDERING else None
+        player = self.player
+        camera = self.camera
+        self.view_rects = view = self._view_rects(1.0 if self.lv_cleared else alpha)
+        camera.follow(view[player])
+
+        # Lighting is carved once per frame (screen space), then applied to every redrawn area
+        if not self.lv_cleared:
+            lights = self.light_manager
+            lights.set_occluders(self.map_handler.occluders if SHADOWS_ENABLED else None)
+            lights.add_light(camera.apply_point(view[player].center), self.current_radius, view[player].center)
+            for prop in self.props_group:
+                if prop.light_radius:
+                    lights.add_light(camera.apply_point(view[prop].center), prop.light_radius, view[prop].center)
+            with self.profiler.scope("lights"):
+                self.light_manager.update()
+
+        # Cleared: nothing moves any more, so the frame is composed once and kept
+        if hud and self.lv_cleared:
+            key = (self.map_handler, self.debug)
+            if key == self.frozen_key:
+                return []
+            self.frozen_key = key
+        else:
+            self.frozen_key = None
+
+        # HUD (re-rendered only when the value changes)
+        if self.hud_deaths != self.death_count:
+            self.hud_deaths = self.death_count
+            self.death_surf = text.render(HUD_FONT, f"DEATHS: {self.death_count}", (255, 60, 60))
+            self.death_rect = self.death_surf.get_rect(topright=(WIDTH - 25, 25))
+        if self.debug:
+            self.debug_lines = self._debug_lines()
+            if self.profile_surf is None:
+                self.profile_surf = pygame.Surface(PROFILE_PANEL.size).convert()
+            Debugger.draw_profile(self.profile_surf, self.profiler, self.profile_surf.get_rect(),
+                                  1000 / (RENDER_FPS or FPS))
+
+        if hud and self.renderer:
+            return self.renderer.render(screen, self._compose, self._live_rects(),
+                                        (self.map_handler, camera.offset, self.lv_cleared, self.debug))
+
+        self._compose(screen, hud)
+        if self.renderer:
+            self.renderer.invalidate()
+        return None
+
+    def _view_rects(self, alpha):
+        """World rect each sprite is drawn at: `alpha` of the way from its pre-step position."""
+        prev = self.prev_pos
+        rects = {}
+        for sprite in self.all_sprites:
+            rect = sprite.rect
+            start = prev.get(sprite) if alpha < 1 else None
+            if start is not None and (start.x != rect.x or start.y != rect.y):
+                back = 1 - alpha
+                rect = rect.move(round((start.x - rect.x) * back), round((start.y - rect.y) * back))
+            rects[sprite] = rect
+        return rects
+
+    def _live_rects(self):
+        """Screen areas that may differ from the previous frame."""
+        rects = [self.death_rect.inflate(22, 12)]
+        if not self.lv_cleared:
+            rects.extend(self.light_manager.screen_holes)
+        effects = self.effects.bounds(self.camera.offset)
+        if effects:
+            rects.append(effects)
+        if self.lv_cleared or self.debug:
+            # Sprites (and their hitbox outlines) visible outside the light holes
+            rects.extend(self.camera.apply(r).inflate(4, 4) for r in self.view_rects.values())
+            if self.debug:
+                rects.extend(self.camera.apply(s.rect).inflate(4, 4) for s in self.all_sprites)
+        if self.debug:
+            rects.append(self.debug_rect.inflate(80, 4))  # Room for the text to grow
+            rects.append(PROFILE_PANEL)
+        return rects
+
+    def _debug_lines(self):
+        tested, naive = self.map_handler.broadphase_stats()
+        assets = cache_stats()
+        lines = [
+            f"BROADPHASE: {tested} / {naive} rects tested",
+            f"ASSETS: {assets['hits']} hits / {assets['misses']} misses, {assets['bytes'] // 1024} KB",
+        ]
+        lines.append("PHASES: " + "  ".join(f"{p} {self.timings[p] * 1000:.2f}" for p in PHASES) + " ms")
+        texts = text.text_stats()
+        lines.append(f"TEXT: {texts['hits']} hits / {texts['misses']} misses, {texts['entries']} cached, {texts['fonts']} fonts")
+        lights = self.light_manager
+        lines.append(f"SHADOWS: {len(self.map_handler.occluders)} edges, "
+                     f"{lights.shadow_hits} hits / {lights.shadow_misses} misses")
+        for graph in self.map_handler.nav_graphs.values():
+            lines.append(f"NAV {graph.speed}: {len(graph)} platforms, {graph.link_count()} links, "
+                         f"paths {graph.hits} hits / {graph.misses} misses")
+        chunks, total, chunk_bytes = self.map_handler.renderer.stats()
+        lines.append(f"CHUNKS: {chunks} / {total} baked, {chunk_bytes // 1024} KB")
+        if self.renderer:
+            area = self.renderer.pixel_area
+            lines.append(f"DIRTY: {self.renderer.rect_count} rects, {area} px ({100 * area / (WIDTH * HEIGHT):.1f}%)")
+        return lines
+
+    def _compose(self, screen, hud=True):
+        """Paint the whole frame; honours the screen clip set by DirtyRenderer."""
+        camera = self.camera
+        profiler = self.profiler
+
+        with profiler.scope("map"):
+            screen.fill((0, 0, 0))
+            self.map_handler.draw(screen, camera)
+
+        with profiler.scope("sprites"):
+            for sprite, rect in self.view_rects.items():
+                screen.blit(sprite.image, camera.apply(rect))
+            self.effects.draw(screen, camera.offset)
+
+        # Lighting
+        if not self.lv_cleared:
+            with profiler.scope("lights"):
+                self.light_manager.apply(screen)
+
+        if not hud:
+            return
+        with profiler.scope("hud"):
+            self._compose_hud(screen)
+
+    def _compose_hud(self, screen):
+        player = self.player
+        camera = self.camera
+
+        # Semi-transparent backing box
+        bg_rect = self.death_rect.inflate(20, 10)
+        pygame.draw.rect(screen, (0, 0, 0, 160), bg_rect, border_radius=5)
+        pygame.draw.rect(screen, (255, 60, 60), bg_rect, 1, border_radius=5)  # Thin red border
+        screen.blit(self.death_surf, self.death_rect)
+
+        # Debug (hitboxes are the simulation rects, not the interpolated ones)
+        if self.debug:
+            Debugger.draw_hitboxes(screen, player, self.enemies, self.props_group, self.dest_group,
+                                   self.map_handler, camera)
+            self.debug_rect = Debugger.draw_stats(screen, self.debug_lines)
+            screen.blit(self.profile_surf, PROFILE_PANEL)
+
+        # Clear UI
+        if self.lv_cleared:
+            screen.blit(self.clear_overlay, (0, 0))
+            txt = text.render(CLEAR_FONT, "MISSION ACCOMPLISHED", (0, 255, 0))
+            screen.blit(txt, txt.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
+            sub = text.render(CLEAR_FONT, "Press 'ENTER' to Menu", (200, 200, 200))
+            screen.blit(sub, sub.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 80)))
@@ -0,0 +1,123 @@
+import pygame
+
+
+def _cover(rects, xs, ys):
+    """Occupancy of the compressed grid cells spanned by xs × ys."""
+    x_index = {x: i for i, x in enumerate(xs)}
+    y_index = {y: j for j, y in enumerate(ys)}
+    grid = [[False] * (len(xs) - 1) for _ in range(len(ys) - 1)]
+    for r in rects:
+        for j in range(y_index[r.top], y_index[r.bottom]):
+            row = grid[j]
+            for i in range(x_index[r.left], x_index[r.right]):
+                row[i] = True
+    return grid
+
+
+def _greedy(grid, xs, ys, transpose=False):
+    """Disjoint rects covering the filled cells: run along a row, then grow down."""
+    if transpose:
+        grid = [list(col) for col in zip(*grid)] if grid else []
+        xs, ys = ys, xs
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    used = [[False] * cols for _ in range(rows)]
+    out = []
+    for j in range(rows):
+        for i in range(cols):
+            if not grid[j][i] or used[j][i]:
+                continue
+            i2 = i
+            while i2 < cols and grid[j][i2] and not used[j][i2]:
+                i2 += 1
+            j2 = j + 1
+            while j2 < rows and all(grid[j2][k] and not used[j2][k] for k in range(i, i2)):
+                j2 += 1
+            for jj in range(j, j2):
+                for k in range(i, i2):
+                    used[jj][k] = True
+            x, y, w, h = xs[i], ys[j], xs[i2] - xs[i], ys[j2] - ys[j]
+            out.append(pygame.Rect(y, x, h, w) if transpose else pygame.Rect(x, y, w, h))
+    return out
+
+
+def _fuse_runs(items, vertical):
+    """One sweep: fuse same-column (vertical) or same-row rects that touch or overlap.
+
+    items: (order, rect) pairs; a fused rect keeps the lowest order. Sorted
+    by column/row, then along it, so each run is fused in one pass.
+    """
+    if vertical:
+        key = lambda item: (item[1].x, item[1].w, item[1].top)
+        same = lambda a, b: a.x == b.x and a.w == b.w and b.top <= a.bottom
+    else:
+        key = lambda item: (item[1].y, item[1].h, item[1].left)
+        same = lambda a, b: a.y == b.y and a.h == b.h and b.left <= a.right
+    out = []
+    for order, r in sorted(items, key=key):
+        if out and same(out[-1][1], r):
+            out[-1] = (min(out[-1][0], order), out[-1][1].union(r))
+        else:
+            out.append((order, r))
+    return out
+
+
+def _merge_aligned(rects):
+    """Fuse aligned rects (stacked columns, then side-by-side rows) until nothing changes.
+
+    Each round is two sorted sweeps; the result keeps the input order (by
+    each fused rect's first member). It covers the same pixels but may
+    still overlap where the input did.
+    """
+    items = list(enumerate(rects))
+    count = None
+    while count != len(items):
+        count = len(items)
+        items = _fuse_runs(_fuse_runs(items, vertical=True), vertical=False)
+    return [r for _, r in sorted(items, key=lambda item: item[0])]
+
+
+def merge_rects(rects):
+    """Merge touching/overlapping rects into fewer disjoint ones, same solid pixels.
+
+    Candidates: sweeps fusing aligned rects (only if the result is disjoint),
+    and row-first and column-first sweeps over a grid cut at the rects' own
+    edges (disjoint by construction). Every candidate is exact; the smallest
+    wins. The input is returned unchanged if none beats it (it may overlap).
+    """
+    solid = [pygame.Rect(r) for r in rects if r[2] > 0 and r[3] > 0]
+    if len(solid) < 2:
+        return solid
+    xs = sorted({r.left for r in solid} | {r.right for r in solid})
+    ys = sorted({r.top for r in solid} | {r.bottom for r in solid})
+    grid = _cover(solid, xs, ys)
+    candidates = [_greedy(grid, xs, ys), _greedy(grid, xs, ys, transpose=True)]
+    # Same pixels, so the areas only add up to the covered area when nothing overlaps
+    covered = sum((xs[i + 1] - xs[i]) * (ys[j + 1] - ys[j])
+                  for j, row in enumerate(grid) for i, filled in enumerate(row) if filled)
+    aligned = _merge_aligned(solid)
+    if sum(r.w * r.h for r in aligned) == covered:
+        candidates.insert(0, aligned)
+    merged = min(candidates, key=len)
+    return merged if len(merged) < len(solid) else solid
+
+
+def coverage_mask(rects, bounds):
+    """pygame.Mask of the pixels covered by rects, relative to bounds.topleft."""
+    mask = pygame.mask.Mask(bounds.size)
+    for r in rects:
+        r = pygame.Rect(r)
+        if r.width > 0 and r.height > 0:
+            mask.draw(pygame.mask.Mask(r.size, fill=True), (r.x - bounds.x, r.y - bounds.y))
+    return mask
+
+
+def same_coverage(a, b):
+    """True if both rect lists cover exactly the same pixels."""
+    rects = [pygame.Rect(r) for r in list(a) + list(b) if r[2] > 0 and r[3] > 0]
+    if not rects:
+        return True
+    bounds = rects[0].unionall(rects[1:])
+    mask_a, mask_b = coverage_mask(a, bounds), coverage_mask(b, bounds)
+    count = mask_a.count()
+    return count == mask_b.count() == mask_a.overlap_area(mask_b, (0, 0))
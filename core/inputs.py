@@ -0,0 +1,20 @@
+import pygame
+
+# Per-frame input bitmask consumed by Player.update
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+RESET = 8  # Manual restart (R), recorded so replays stay deterministic
+
+
+def read_keyboard():
+    """Sample the keyboard into an input bitmask."""
+    keys = pygame.key.get_pressed()
+    mask = 0
+    if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        mask |= LEFT
+    if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        mask |= RIGHT
+    if keys[pygame.K_SPACE] or keys[pygame.K_w] or keys[pygame.K_UP]:
+        mask |= JUMP
+    return mask
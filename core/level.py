@@ -1,37 +1,54 @@
 import pygame
-import math
 import random
-from settings import WIDTH, HEIGHT
+import numpy as np
+from settings import WIDTH, HEIGHT, MENU_PARTICLES, MENU_PARTICLE_FRAMES
+from core import text
+from core.particles import ParticleSystem, polygon_strip, BY_ANGLE
+
+TITLE_FONT = ("Verdana", 80, True)
+BTN_FONT = ("Verdana", 32, True)
+TIP_FONT = ("Consolas", 20, False)
 
 class LvSelect:
     def __init__(self, screen):
         self.screen = screen
-        self.title_font = pygame.font.SysFont("Verdana", 80, bold=True)
-        self.btn_font = pygame.font.SysFont("Verdana", 32, bold=True)
-        self.tip_font = pygame.font.SysFont("Consolas", 20)
-
         self.buttons = []
         self.time = 0
 
-        self.particles = []
-        for _ in range(18):
-            self.particles.append({
-                "pos": [random.randint(0, WIDTH), random.randint(0, HEIGHT)],
-                "size": random.randint(40, 100),
-                "speed": random.uniform(0.5, 1.2),
-                "angle": random.uniform(0, 360),
-                "rot_speed": random.uniform(0.2, 0.6),
-                "color": (40, 90, 70)
-            })
+        # Rising triangles: pre-rotated outlines per size bucket, stepped as arrays
+        sizes = range(40, 101, 10)
+        strips = [polygon_strip(3, size, (40, 90, 70), MENU_PARTICLE_FRAMES) for size in sizes]
+        self.particles = ParticleSystem(strips, MENU_PARTICLES, frame_by=BY_ANGLE, period=120, wrap=(WIDTH, HEIGHT))
+        rng = np.random.default_rng()
+        n = MENU_PARTICLES
+        self.particles.emit(
+            np.column_stack((rng.integers(0, WIDTH, n, endpoint=True), rng.integers(0, HEIGHT, n, endpoint=True))),
+            np.column_stack((np.zeros(n), -rng.uniform(0.5, 1.2, n))),
+            kind=rng.integers(0, len(strips), n),
+            angle=rng.uniform(0, 360, n),
+            spin=rng.uniform(0.2, 0.6, n),
+        )
 
         self.scanners = []
         for _ in range(4):
+            alpha = random.randint(60, 120)
+            line_surf = pygame.Surface((WIDTH, 3), pygame.SRCALPHA)
+            line_surf.fill((60, 150, 100, alpha))
             self.scanners.append({
                 "y": random.randint(0, HEIGHT),
                 "speed": random.uniform(2.0, 4.0),
-                "alpha": random.randint(60, 120)
+                "surf": line_surf
             })
 
+        # Static background (fill + grid) baked once
+        self.background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self.background.fill((3, 5, 10))
+        grid_color = (25, 45, 35)
+        for x in range(0, WIDTH, 50):
+            pygame.draw.line(self.background, grid_color, (x, 0), (x, HEIGHT), 1)
+        for y in range(0, HEIGHT, 50):
+            pygame.draw.line(self.background, grid_color, (0, y), (WIDTH, y), 1)
+
         for i in range(1, 6):
             rect = pygame.Rect(WIDTH // 2 - 120, 240 + (i - 1) * 85, 240, 65)
             self.buttons.append({
@@ -40,35 +57,15 @@ class LvSelect:
             })
 
     def _draw_cool_background(self):
-        self.screen.fill((3, 5, 10)) 
+        self.screen.blit(self.background, (0, 0))
 
-        grid_color = (25, 45, 35)
-        for x in range(0, WIDTH, 50):
-            pygame.draw.line(self.screen, grid_color, (x, 0), (x, HEIGHT), 1)
-        for y in range(0, HEIGHT, 50):
-            pygame.draw.line(self.screen, grid_color, (0, y), (WIDTH, y), 1)
-
-        for p in self.particles:
-            p["pos"][1] -= p["speed"]
-            p["angle"] += p["rot_speed"]
-            if p["pos"][1] < -p["size"]:
-                p["pos"][1] = HEIGHT + p["size"]
-
-            points = []
-            for j in range(3):
-                ang = math.radians(p["angle"] + j * 120)
-                px = p["pos"][0] + math.cos(ang) * (p["size"] // 2)
-                py = p["pos"][1] + math.sin(ang) * (p["size"] // 2)
-                points.append((px, py))
-            pygame.draw.polygon(self.screen, p["color"], points, 2)
+        self.particles.update()
+        self.particles.draw(self.screen)
 
         for s in self.scanners:
             s["y"] += s["speed"]
             if s["y"] > HEIGHT: s["y"] = -10
-
-            line_surf = pygame.Surface((WIDTH, 3), pygame.SRCALPHA)
-            line_surf.fill((60, 150, 100, s["alpha"])) 
-            self.screen.blit(line_surf, (0, int(s["y"])))
+            self.screen.blit(s["surf"], (0, int(s["y"])))
 
     def draw(self):
         self.time += 1
@@ -78,10 +75,10 @@ class LvSelect:
         title_pos = (WIDTH // 2, 110)
 
         for i in range(4, 0, -1):
-            glow_surf = self.title_font.render(title_text, True, (30, 90, 60))
+            glow_surf = text.render(TITLE_FONT, title_text, (30, 90, 60))
             self.screen.blit(glow_surf, glow_surf.get_rect(center=(title_pos[0] + i, title_pos[1] + i)))
 
-        main_title = self.title_font.render(title_text, True, (220, 255, 230))
+        main_title = text.render(TITLE_FONT, title_text, (220, 255, 230))
         self.screen.blit(main_title, main_title.get_rect(center=title_pos))
 
 
@@ -106,13 +103,13 @@ class LvSelect:
             pygame.draw.rect(self.screen, bg_color, draw_rect, border_radius=4)
             pygame.draw.rect(self.screen, border_color, draw_rect, 2 if is_hover else 1, border_radius=4)
 
-            txt_surf = self.btn_font.render(btn["name"], True, (255, 255, 255))
+            txt_surf = text.render(BTN_FONT, btn["name"], (255, 255, 255))
             self.screen.blit(txt_surf, txt_surf.get_rect(center=draw_rect.center))
 
         pygame.draw.line(self.screen, (80, 200, 120), (WIDTH // 4, HEIGHT - 75), (3 * WIDTH // 4, HEIGHT - 75), 3)
 
         controls_text = "A/D: MOVE  |  W/SPACE: JUMP  |  Esc: PAUSE  |  R: RESET  |  CLICK MISSION"
-        tip_surf = self.tip_font.render(controls_text, True, (130, 170, 150))
+        tip_surf = text.render(TIP_FONT, controls_text, (130, 170, 150))
         self.screen.blit(tip_surf, tip_surf.get_rect(center=(WIDTH // 2, HEIGHT - 45)))
 
     def handle_input(self, event):
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import struct
+from array import array
+from settings import LEVEL_CACHE_DIR, CHUNK_TILES, resource_path
+
+# Compiled level file (.lvc):
+#   header  : magic, version, meta length
+#   meta    : JSON (content hash, source stats, sizes, section table)
+#   sections: packed rect arrays (int32 x, y, w, h), then the baked map as
+#             raw RGB pixels, one section per chunk (read on demand)
+MAGIC = b"INKL"
+VERSION = 6  # 2: rects stored merged, 3: map pixels flattened (opaque), 4: no level entry,
+               # 5: RGB chunks, 6: merged rects always disjoint
+_HEADER = struct.Struct("<4sHI")
+RECT_LAYERS = ("walls", "hazards", "bouncers")
+
+
+def cache_path(tmx_file):
+    level_id = os.path.splitext(os.path.basename(tmx_file))[0]
+    return resource_path(os.path.join(LEVEL_CACHE_DIR, f"{level_id}.lvc"))
+
+
+def _stat(path):
+    st = os.stat(resource_path(path))
+    return [st.st_size, st.st_mtime_ns]
+
+
+def content_hash(sources):
+    digest = hashlib.sha1()
+    for path in sources:
+        with open(resource_path(path), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _pack_rects(rects):
+    flat = array("i")
+    for r in rects:
+        flat.extend((r[0], r[1], r[2], r[3]))
+    return flat.tobytes()
+
+
+def _unpack_rects(data):
+    flat = array("i")
+    flat.frombytes(data)
+    return [tuple(flat[i:i + 4]) for i in range(0, len(flat), 4)]
+
+
+def save(path, sources, size, tile_size, rect_layers, chunks):
+    """Write a compiled level.
+
+    sources:     files the level was built from (TMX, tilesets),
+                 relative to the resource root
+    rect_layers: {"walls": [(x, y, w, h), ...], ...}
+    chunks:      [((x, y), (w, h), rgb_bytes), ...] baked map pixels per
+                 CHUNK_TILES chunk (a cache with other chunks is stale)
+    """
+    sections = []
+    blobs = []
+    offset = 0
+    for name in RECT_LAYERS:
+        blob = _pack_rects(rect_layers.get(name, []))
+        sections.append({"name": name, "kind": "rects", "offset": offset, "length": len(blob)})
+        blobs.append(blob)
+        offset += len(blob)
+    for pos, chunk, pixels in chunks:
+        sections.append({"name": "chunk", "kind": "rgb", "pos": list(pos), "size": list(chunk),
+                         "offset": offset, "length": len(pixels)})
+        blobs.append(pixels)
+        offset += len(pixels)
+
+    meta = json.dumps({
+        "hash": content_hash(sources),
+        "sources": {src: _stat(src) for src in sources},
+        "size": list(size),
+        "tile_size": list(tile_size),
+        "chunk_tiles": CHUNK_TILES,
+        "sections": sections,
+    }).encode("utf-8")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(meta)))
+        f.write(meta)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+
+
+def load(path):
+    """Read a compiled level's header and rects. Returns None if missing or stale.
+
+    Freshness is checked by stat first; only when a source's size/mtime
+    moved is its content re-hashed, so a touched but unchanged file does
+    not force a rebuild. Map pixels stay on disk: "chunks" maps each chunk's
+    world (x, y) to its size and file location, for read_chunk().
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_HEADER.size)
+            magic, version, meta_len = _HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                return None
+            meta = json.loads(f.read(meta_len).decode("utf-8"))
+            if meta["chunk_tiles"] != CHUNK_TILES:
+                return None
+
+            sources = meta["sources"]
+            if any(_stat(src) != stat for src, stat in sources.items()):
+                if content_hash(sources) != meta["hash"]:
+                    return None
+
+            body = _HEADER.size + meta_len
+            st = os.fstat(f.fileno())
+            level = {
+                "size": tuple(meta["size"]),
+                "tile_size": tuple(meta["tile_size"]),
+                "chunks": {},
+                "file": (path, st.st_size, st.st_mtime_ns),
+                "bytes": body,
+            }
+            for section in meta["sections"]:
+                start = body + section["offset"]
+                if section["kind"] == "rects":
+                    f.seek(start)
+                    level[section["name"]] = _unpack_rects(f.read(section["length"]))
+                    level["bytes"] += section["length"]
+                else:
+                    level["chunks"][tuple(section["pos"])] = (tuple(section["size"]), start, section["length"])
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    return level
+
+
+def read_chunk(cache_file, offset, length):
+    """Raw pixels of one chunk from a file load() returned, or None if it has since been rewritten."""
+    path, size, mtime = cache_file
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                return None
+            f.seek(offset)
+            data = f.read(length)
+    except OSError:
+        return None
+    return data if len(data) == length else None
@@ -0,0 +1,154 @@
+import json
+import os
+from numbers import Real
+from typing import NamedTuple, Optional, Tuple
+from settings import LEVEL_DATA_PATH, resource_path
+from sprites.enemy import PATROL, CHASE
+
+PROP_TYPES = (1, 2, 3, 4)  # 1:Jump, 2:Anti-Explosion, 3:Shield, 4:Torch
+BEHAVIORS = (PATROL, CHASE)
+
+
+class LevelDataError(ValueError):
+    """lvsetting.json could not be read, or an entry in it is malformed."""
+
+
+class EnemySpec(NamedTuple):
+    start_pos: Tuple[float, float]
+    move_range: float
+    speed: float
+    behavior: str = PATROL
+
+
+class PropSpec(NamedTuple):
+    pos: Tuple[float, float]
+    type: int
+
+
+class LevelData(NamedTuple):
+    level_id: str
+    player_spawn: Tuple[float, float]
+    destination: Optional[Tuple[float, float]]
+    enemies: Tuple[EnemySpec, ...]
+    props: Tuple[PropSpec, ...]
+
+
+# Process-wide copy of lvsetting.json as records, keyed by level id.
+# Re-parsed only when the file's mtime (or size) moves; checked by get(),
+# which the game calls on level load, never on reset.
+_levels = {}
+_stamp = None
+
+
+def _number(value, where, minimum=None, positive=False):
+    if isinstance(value, bool) or not isinstance(value, Real):
+        raise LevelDataError(f"{where}: expected a number, got {value!r}")
+    if positive and value <= 0:
+        raise LevelDataError(f"{where}: must be > 0, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise LevelDataError(f"{where}: must be >= {minimum}, got {value!r}")
+    return value
+
+
+def _point(value, where):
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise LevelDataError(f"{where}: expected [x, y], got {value!r}")
+    return (_number(value[0], where), _number(value[1], where))
+
+
+def _list(entry, key, where):
+    value = entry.get(key, [])
+    if not isinstance(value, list):
+        raise LevelDataError(f"{where}.{key}: expected a list, got {value!r}")
+    return value
+
+
+def _enemy(entry, where):
+    if not isinstance(entry, dict):
+        raise LevelDataError(f"{where}: expected an object, got {entry!r}")
+    for key in ("start_pos", "move_range", "speed"):
+        if key not in entry:
+            raise LevelDataError(f"{where}: missing '{key}'")
+    behavior = entry.get("behavior", PATROL)
+    if behavior not in BEHAVIORS:
+        raise LevelDataError(f"{where}.behavior: expected one of {BEHAVIORS}, got {behavior!r}")
+    return EnemySpec(
+        _point(entry["start_pos"], f"{where}.start_pos"),
+        _number(entry["move_range"], f"{where}.move_range", minimum=0),
+        _number(entry["speed"], f"{where}.speed", positive=True),
+        behavior,
+    )
+
+
+def _prop(entry, where):
+    if not isinstance(entry, dict):
+        raise LevelDataError(f"{where}: expected an object, got {entry!r}")
+    for key in ("pos", "type"):
+        if key not in entry:
+            raise LevelDataError(f"{where}: missing '{key}'")
+    if entry["type"] not in PROP_TYPES or isinstance(entry["type"], bool):
+        raise LevelDataError(f"{where}.type: expected one of {PROP_TYPES}, got {entry['type']!r}")
+    return PropSpec(_point(entry["pos"], f"{where}.pos"), entry["type"])
+
+
+def parse_level(level_id, entry):
+    """Validate one lvsetting.json entry into a LevelData record."""
+    where = level_id
+    if not isinstance(entry, dict):
+        raise LevelDataError(f"{where}: expected an object, got {entry!r}")
+    if "player_spawn" not in entry:
+        raise LevelDataError(f"{where}: missing 'player_spawn'")
+    destination = entry.get("destination")
+    return LevelData(
+        level_id,
+        _point(entry["player_spawn"], f"{where}.player_spawn"),
+        None if destination is None else _point(destination, f"{where}.destination"),
+        tuple(_enemy(e, f"{where}.enemies[{i}]") for i, e in enumerate(_list(entry, "enemies", where))),
+        tuple(_prop(p, f"{where}.props[{i}]") for i, p in enumerate(_list(entry, "props", where))),
+    )
+
+
+def parse_file(path):
+    """All levels of a lvsetting.json file as {level id: LevelData}."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except OSError as e:
+        raise LevelDataError(f"{path}: {e.strerror}")
+    except ValueError as e:
+        raise LevelDataError(f"{path}: invalid JSON: {e}")
+    if not isinstance(data, dict):
+        raise LevelDataError(f"{path}: expected an object of levels")
+    try:
+        return {level_id: parse_level(level_id, entry) for level_id, entry in data.items()}
+    except LevelDataError as e:
+        raise LevelDataError(f"{path}: {e}")
+
+
+def refresh():
+    """Re-parse lvsetting.json if it changed on disk since the last parse.
+
+    A failed parse raises LevelDataError and keeps the previous records, so
+    the next call tries again.
+    """
+    global _levels, _stamp
+    path = resource_path(LEVEL_DATA_PATH)
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        raise LevelDataError(f"{path}: {e.strerror}")
+    # Size too: two saves within the filesystem's timestamp granularity share an mtime
+    stamp = (st.st_mtime_ns, st.st_size)
+    if stamp != _stamp:
+        _levels = parse_file(path)
+        _stamp = stamp
+
+
+def get(level_id):
+    """The LevelData of `level_id` (e.g. "lv3"), reloading the file first if it changed."""
+    refresh()
+    level = _levels.get(level_id)
+    if level is None:
+        raise LevelDataError(f"{resource_path(LEVEL_DATA_PATH)}: no entry for '{level_id}'")
+    return level
+
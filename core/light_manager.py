@@ -1,15 +1,57 @@
 import pygame
+from collections import OrderedDict
 from settings import *
+from core.renderer import merge_overlapping
 
 class LightManager:
-    def __init__(self, light_radius):
+    """Accumulates point lights into a reduced-resolution dark map.
+
+    Lights are queued with add_light() during the frame; draw() carves them
+    into a 1/LIGHT_MAP_SCALE buffer, upsamples the changed area once and
+    applies the result to the screen in a single blit.
+
+    With occluders set (see set_occluders()), a light given its world
+    position is clipped to what it can see: the brush is masked by the
+    visibility polygon. Masked brushes are cached by quantized world
+    position and radius, so a light that does not move costs a single blit.
+    """
+
+    def __init__(self, light_radius, scale=LIGHT_MAP_SCALE):
         self.default_radius = light_radius
-        self.dark_mask = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        
+        self.scale = scale
+        self.smooth = SMOOTH_LIGHTING_ENABLED
+
+        # Low-res darkness buffer and its full-res upsampled copy
+        self.dark_mask = pygame.Surface((WIDTH // scale, HEIGHT // scale), pygame.SRCALPHA)
+        self.dark_mask.fill((0, 0, 0, 255))
+        self.mask_rect = self.dark_mask.get_rect()
+        if scale == 1:
+            self.light_map = self.dark_mask  # Full resolution: nothing to upsample
+        else:
+            self.light_map = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            self.light_map.fill((0, 0, 0, 255))
+        self.screen_rect = self.light_map.get_rect()
+
+        # Areas carved on the previous frame (low-res); only these are re-darkened
+        self.prev_holes = []
+        self.lights = []
+        # Current holes in screen coordinates (dirty-rect rendering)
+        self.screen_holes = []
+
         # Create a base gradient circle (512x512) for later scaling
         self.base_size = 512
         self.base_brush = self._create_base_brush(self.base_size // 2)
 
+        # Scaled brushes keyed by quantized radius (LRU)
+        self.brush_cache = OrderedDict()
+        self.radius_step = max(1, LIGHT_RADIUS_STEP // scale)
+
+        # Shadow casting: level occluders and masked brushes keyed by (x, y, radius) (LRU)
+        self.occluders = None
+        self.shadow_cache = OrderedDict()
+        self.shadow_hits = 0
+        self.shadow_misses = 0
+
     def _create_base_brush(self, radius):
         """Creates a fixed base gradient circle."""
         brush_size = radius * 2
@@ -23,24 +65,109 @@ class LightManager:
             pygame.draw.circle(surface, (0, 0, 0, alpha), (radius, radius), r)
         return surface
 
-    def draw(self, screen, player_rect, current_radius):
-        # 1. Fill mask with solid black
-        self.dark_mask.fill((0, 0, 0, 255))
+    def _get_brush(self, radius):
+        """Scaled brush for a quantized radius, built on first use."""
+        brush = self.brush_cache.get(radius)
+        if brush is not None:
+            self.brush_cache.move_to_end(radius)
+            return brush
+        if self.smooth:
+            brush = pygame.transform.smoothscale(self.base_brush, (radius * 2, radius * 2))
+        else:
+            brush = pygame.transform.scale(self.base_brush, (radius * 2, radius * 2))
+        self.brush_cache[radius] = brush
+        if len(self.brush_cache) > LIGHT_BRUSH_CACHE_SIZE:
+            self.brush_cache.popitem(last=False)
+        return brush
 
-        # 2. Scale base brush according to current radius
-        r_int = int(current_radius)
-        if r_int <= 0: return # Prevent error if radius is 0
-        
-        # Dynamic scaling of brush
-        scaled_brush = pygame.transform.scale(self.base_brush, (r_int * 2, r_int * 2))
-        
-        # 3. Calculate draw position (center brush on player)
-        center = player_rect.center
-        blit_x = center[0] - r_int
-        blit_y = center[1] - r_int
+    def set_occluders(self, occluders):
+        """Walls that block light (core.shadows.Occluders), or None for no shadows."""
+        if occluders is not self.occluders:
+            self.occluders = occluders
+            self.shadow_cache.clear()
+
+    def _shadow_brush(self, world, r_low):
+        """Brush for a light at `world`, dark wherever walls block its line of sight."""
+        s = self.scale
+        # One low-res pixel of movement is one cache key
+        key = (int(world[0]) // s, int(world[1]) // s, r_low)
+        brush = self.shadow_cache.get(key)
+        if brush is not None:
+            self.shadow_cache.move_to_end(key)
+            self.shadow_hits += 1
+            return brush
+        self.shadow_misses += 1
+
+        polygon = self.occluders.visibility((key[0] * s, key[1] * s), r_low * s, SHADOW_WALL_DEPTH)
+        points = polygon / s - (key[0] - r_low, key[1] - r_low)  # World -> brush pixels
+        brush = pygame.Surface((r_low * 2, r_low * 2), pygame.SRCALPHA)
+        brush.fill((0, 0, 0, 255))
+        pygame.draw.polygon(brush, (0, 0, 0, 0), points.tolist())
+        brush.blit(self._get_brush(r_low), (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+
+        self.shadow_cache[key] = brush
+        if len(self.shadow_cache) > SHADOW_CACHE_SIZE:
+            self.shadow_cache.popitem(last=False)
+        return brush
+
+    def add_light(self, center, radius, world=None):
+        """Queue a point light (screen coordinates) for the next draw().
+
+        world: the light's world position; required for it to cast shadows.
+        """
+        self.lights.append((center, radius, world))
+
+    def _upsample(self, area):
+        """Refresh the full-res light map from the low-res buffer inside `area`."""
+        s = self.scale
+        if s == 1:
+            return
+        dest = pygame.Rect(area.x * s, area.y * s, area.w * s, area.h * s).clip(self.screen_rect)
+        if not dest.w or not dest.h:
+            return
+        src = self.dark_mask.subsurface(area)
+        target = self.light_map.subsurface(dest)
+        if self.smooth:
+            pygame.transform.smoothscale(src, dest.size, target)
+        else:
+            pygame.transform.scale(src, dest.size, target)
+
+    def draw(self, screen):
+        self.update()
+        self.apply(screen)
+
+    def apply(self, screen):
+        screen.blit(self.light_map, (0, 0))
+
+    def update(self):
+        """Carve the queued lights and refresh the full-res light map."""
+        lights, self.lights = self.lights, []
+        s = self.scale
+
+        # 1. Re-darken only what the previous holes uncovered
+        dirty = self.prev_holes
+        for hole in dirty:
+            self.dark_mask.fill((0, 0, 0, 255), hole)
 
-        # 4. Carve hole using BLEND_RGBA_MIN
-        self.dark_mask.blit(scaled_brush, (blit_x, blit_y), special_flags=pygame.BLEND_RGBA_MIN)
+        # 2. Carve every visible light using BLEND_RGBA_MIN
+        holes = []
+        for (cx, cy), radius, world in lights:
+            # Quantize radius so the torch lerp reuses cached brushes
+            r_low = int(round(radius / s / self.radius_step)) * self.radius_step
+            if r_low <= 0:
+                continue
+            pos = (cx // s - r_low, cy // s - r_low)
+            if not self.mask_rect.colliderect((pos, (r_low * 2, r_low * 2))):
+                continue  # Off-screen
+            if self.occluders is not None and world is not None:
+                brush = self._shadow_brush(world, r_low)
+            else:
+                brush = self._get_brush(r_low)
+            hole = self.dark_mask.blit(brush, pos, special_flags=pygame.BLEND_RGBA_MIN)
+            holes.append(hole)
+        self.prev_holes = holes
+        self.screen_holes = [pygame.Rect(h.x * s, h.y * s, h.w * s, h.h * s) for h in holes]
 
-        # 5. Blit to main screen
-        screen.blit(self.dark_mask, (0, 0))
\ No newline at end of file
+        # 3. Upsample the changed areas; apply() puts them on screen in a single blit
+        for area in merge_overlapping(dirty + holes):
+            self._upsample(area)
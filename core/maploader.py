@@ -1,105 +1,289 @@
 import os
 import pygame
 import pytmx
-import json
-from settings import WIDTH, HEIGHT, LEVEL_DATA_PATH, resource_path
+from pytmx.util_pygame import pygame_image_loader
+import time
+from settings import WIDTH, HEIGHT, TILE_SIZE, LEVEL_CACHE_ENABLED, resource_path
+from core import level_cache, text
+from core.spatial import SpatialHash
+from core.shadows import Occluders
+from core.navigation import build_nav_graph
+from core.geometry import merge_rects
+from core.chunks import ChunkedMapRenderer
 from typing import List
 
+def _load_objects_from_layer(tmx_data, layer_name):
+    rect_list = []
+    try:
+        obj_layer = tmx_data.get_layer_by_name(layer_name)
+        for obj in obj_layer:
+            rect_list.append(pygame.Rect(obj.x, obj.y, obj.width, obj.height))
+    except:
+        pass
+    return rect_list
+
+
+def parse_level(filename):
+    """First load stage: file reads, XML parsing and rect extraction only.
+
+    Creates no pygame surfaces, so it is safe on a worker thread. Returns the
+    compiled cache contents when fresh, else the parsed TMX (tile images not
+    loaded yet) with its rects.
+    """
+    if LEVEL_CACHE_ENABLED:
+        compiled = level_cache.load(level_cache.cache_path(filename))
+        if compiled:
+            return {"filename": filename, "compiled": compiled}
+    try:
+        # Load TMX data (supports PyInstaller temp path)
+        tmx_data = pytmx.TiledMap(resource_path(filename))
+    except Exception as e:
+        raise FileNotFoundError(f"TMX load failed: {e}")
+
+    level_id = os.path.basename(filename).split('.')[0]
+    parsed = {"filename": filename, "tmx": tmx_data}
+    counts = []
+    for key, layer_name in (("walls", "Collision"), ("hazards", "Hazards"), ("bouncers", "Bouncers")):
+        rects = _load_objects_from_layer(tmx_data, layer_name)
+        parsed[key] = merge_rects(rects)
+        counts.append(f"{layer_name} {len(rects)} -> {len(parsed[key])}")
+    print(f"[{level_id}] Merged rects: {', '.join(counts)}")
+    return parsed
+
+
 class TiledMap:
-    def __init__(self, filename):
-        try:
-            # Load TMX data (supports PyInstaller temp path)
-            tmx_path = resource_path(filename)
-            self.tmx_data = pytmx.load_pygame(tmx_path, force_colorkey=(0, 0, 0))
-        except Exception as e:
-            raise FileNotFoundError(f"TMX load failed: {e}")
+    def __init__(self, filename=None):
+        if filename is None:
+            return  # Staged construction, see TiledMap.staged()
+        for _ in self._build(parse_level(filename)):
+            pass
 
-        self.width = self.tmx_data.width * self.tmx_data.tilewidth
-        self.height = self.tmx_data.height * self.tmx_data.tileheight
+    @classmethod
+    def staged(cls, parsed, writer=None):
+        """Build from parse_level() output in small main-thread steps.
 
-        # 1. Pre-render map surface
-        self.map_surface = self._make_map_surface()
+        Returns (map, steps); the map is ready once `steps` is exhausted.
+        writer: optional callable that runs the cache file write (e.g. on a
+        worker thread) instead of writing inline.
+        """
+        tiled_map = cls()
+        return tiled_map, tiled_map._build(parsed, writer)
 
-        # 2. Extract functional objects (Collision, Hazards...)
-        self.walls = self._load_objects_from_layer("Collision")
-        self.hazards = self._load_objects_from_layer("Hazards")
-        self.bouncers = self._load_objects_from_layer("Bouncers")
+    def _build(self, parsed, writer=None):
+        self.filename = parsed["filename"]
+        self.level_id = os.path.basename(self.filename).split('.')[0]
+        busy = 0.0
+        start = time.perf_counter()
 
-        # 3. Load JSON config
-        level_id = os.path.basename(filename).split('.')[0]
-        spawn, dest, enemies, props = self._load_level_data(level_id)
+        # 1. Map image and rects: compiled cache if fresh, else the parsed TMX
+        compiled = parsed.get("compiled")
+        if compiled:
+            self._load_compiled(compiled)
+            source = f"compiled cache ({compiled['bytes'] // 1024} KB read, map chunks on demand)"
+            busy += time.perf_counter() - start
+            yield
+            start = time.perf_counter()
+        else:
+            self._load_tmx(parsed)
+            busy += time.perf_counter() - start
+            yield
+            start = time.perf_counter()
+            # Surface work pygame wants on the main thread, one piece per step
+            self.tmx_data.image_loader = pygame_image_loader
+            self.tmx_data.reload_images()
+            busy += time.perf_counter() - start
+            yield
+            start = time.perf_counter()
+            # Map image is baked lazily in chunks around the camera
+            self.text_objects = self._prepare_text_objects()
+            source = "TMX"
+        self.renderer = ChunkedMapRenderer(self)
 
-        self.player_spawn = spawn
-        self.destination_pos = dest
-        self.enemy_data_list = enemies
-        self.prop_data_list = props
+        # Broadphase grids used by player/enemy collision
+        self.wall_index = SpatialHash(self.walls)
+        self.hazard_index = SpatialHash(self.hazards)
+        self.bouncer_index = SpatialHash(self.bouncers)
+        busy += time.perf_counter() - start
+        yield
+        start = time.perf_counter()
+        # Wall edges that block light
+        self.occluders = Occluders(self.walls)
+        # Platform graphs for chasing enemies, built on first use per speed
+        self.nav_graphs = {}
 
-    def _make_map_surface(self):
-        """Core map rendering: Adds background grid."""
-        temp_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        busy += time.perf_counter() - start
+        print(f"[{self.level_id}] Loaded from {source} in {busy * 1000:.1f} ms")
 
-        # --- [New] Draw background grid ---
+        if not compiled and LEVEL_CACHE_ENABLED:
+            yield
+            yield from self._write_compiled(writer)
+
+    def _load_tmx(self, parsed):
+        self.tmx_data = parsed["tmx"]
+        self.tile_w = self.tmx_data.tilewidth
+        self.tile_h = self.tmx_data.tileheight
+        self.width = self.tmx_data.width * self.tile_w
+        self.height = self.tmx_data.height * self.tile_h
+        self.compiled_chunks = None
+
+        # 2. Functional objects (Collision, Hazards...) were extracted while parsing
+        self.walls = parsed["walls"]
+        self.hazards = parsed["hazards"]
+        self.bouncers = parsed["bouncers"]
+
+    def _load_compiled(self, compiled):
+        self.tmx_data = None
+        self.width, self.height = compiled["size"]
+        self.tile_w, self.tile_h = compiled["tile_size"]
+        self.walls = [pygame.Rect(r) for r in compiled["walls"]]
+        self.hazards = [pygame.Rect(r) for r in compiled["hazards"]]
+        self.bouncers = [pygame.Rect(r) for r in compiled["bouncers"]]
+
+        # Baked chunk pixels stay in the file until the chunk renderer asks for them
+        self.compiled_chunks = compiled["chunks"]
+        self.cache_file = compiled["file"]
+
+    def _write_compiled(self, writer=None):
+        """Bake every chunk once and store them with the rects (one chunk per step)."""
+        filename = self.filename
+        tmx_dir = os.path.dirname(filename)
+        sources = [filename]
+        sources += [os.path.join(tmx_dir, ts.source) for ts in self.tmx_data.tilesets if ts.source]
+        chunks = []
+        for cy in range(self.renderer.rows):
+            for cx in range(self.renderer.cols):
+                area = self.renderer.chunk_rect(cx, cy)
+                chunks.append((area.topleft, area.size, pygame.image.tobytes(self.render_area(area), "RGB")))
+                yield
+        rects = {"walls": list(self.walls), "hazards": list(self.hazards), "bouncers": list(self.bouncers)}
+
+        def write():
+            start = time.perf_counter()
+            try:
+                level_cache.save(
+                    level_cache.cache_path(filename), sources,
+                    (self.width, self.height), (self.tile_w, self.tile_h), rects, chunks,
+                )
+            except OSError as e:
+                print(f"Level cache write failed: {e}")
+                return
+            print(f"[{self.level_id}] Compiled cache written in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        if writer:
+            writer(write)
+        else:
+            write()
+
+    def _prepare_text_objects(self):
+        """Rasterize text objects once; chunks blit them when baked."""
+        texts = {}
+        for layer in self.tmx_data.layers:
+            if isinstance(layer, pytmx.TiledObjectGroup):
+                items = []
+                for obj in layer:
+                    content = obj.properties.get('value')
+                    if content:
+                        text_surf = self._draw_text_from_value(obj, content)
+                        if text_surf:
+                            # Whole pixels, so chunks either side of a seam agree
+                            items.append((text_surf, (int(obj.x), int(obj.y))))
+                texts[id(layer)] = items
+        return texts
+
+    def render_area(self, area):
+        """Core map rendering for one world-space area (a chunk): grid, tiles, text.
+
+        The result is flattened onto black in the display format (no alpha):
+        the map is always drawn over a black screen, so per-pixel alpha is
+        only needed on the tile/text sources, not on the baked chunk.
+        """
+        if self.compiled_chunks is not None:
+            return self._read_chunk(area)  # Compiled level: already rendered
+        ox, oy = area.topleft
+        tw, th = self.tmx_data.tilewidth, self.tmx_data.tileheight
+
+        # --- Draw background grid (one-pixel fills, cheaper than draw.line) ---
         grid_size = 32  # Adjust based on TILE_SIZE
         grid_color = (40, 40, 40)  # Dark gray
+        temp_surface = pygame.Surface(area.size)  # Display format, starts black
 
-        # Vertical lines
-        for x in range(0, self.width, grid_size):
-            pygame.draw.line(temp_surface, grid_color, (x, 0), (x, self.height), 1)
-        # Horizontal lines
-        for y in range(0, self.height, grid_size):
-            pygame.draw.line(temp_surface, grid_color, (0, y), (self.width, y), 1)
+        for x in range(-ox % grid_size, area.w, grid_size):
+            temp_surface.fill(grid_color, (x, 0, 1, area.h))
+        for y in range(-oy % grid_size, area.h, grid_size):
+            temp_surface.fill(grid_color, (0, y, area.w, 1))
         # ---------------------------
 
+        # Tile range covered by the area
+        tx0, ty0 = ox // tw, oy // th
+        tx1 = min(self.tmx_data.width, -(-area.right // tw))
+        ty1 = min(self.tmx_data.height, -(-area.bottom // th))
+        get_tile = self.tmx_data.get_tile_image_by_gid
+
+        # One blit sequence per layer, in draw order
         for layer in self.tmx_data.layers:
             # 1. Tile layers
             if isinstance(layer, pytmx.TiledTileLayer):
-                for x, y, gid in layer:
-                    tile = self.tmx_data.get_tile_image_by_gid(gid)
-                    if tile:
-                        temp_surface.blit(tile, (x * self.tmx_data.tilewidth,
-                                                 y * self.tmx_data.tileheight))
+                blits = []
+                for y in range(ty0, ty1):
+                    row = layer.data[y]
+                    for x in range(tx0, tx1):
+                        tile = get_tile(row[x])
+                        if tile:
+                            blits.append((tile, (x * tw - ox, y * th - oy)))
+                temp_surface.blits(blits, doreturn=False)
 
             # 2. Object layers
             elif isinstance(layer, pytmx.TiledObjectGroup):
-                for obj in layer:
-                    content = obj.properties.get('value')
-                    if content:
-                        self._draw_text_from_value(temp_surface, obj, content)
+                temp_surface.blits([(text_surf, (x - ox, y - oy))
+                                    for text_surf, (x, y) in self.text_objects.get(id(layer), ())],
+                                   doreturn=False)
 
         return temp_surface
 
-    def _draw_text_from_value(self, surface, obj, content):
-        """Draw text based on TMX object properties."""
+    def _read_chunk(self, area):
+        """One chunk of a compiled level, read from the cache file."""
+        size, offset, length = self.compiled_chunks[area.topleft]
+        pixels = level_cache.read_chunk(self.cache_file, offset, length)
+        if pixels is None or size != area.size:
+            print(f"[{self.level_id}] Compiled cache changed on disk, chunk at {area.topleft} left blank")
+            return pygame.Surface(area.size)
+        # Flattened at bake time (no alpha): straight to the display format
+        return pygame.image.frombuffer(pixels, size, "RGB").convert()
+
+    def draw(self, surface, camera):
+        self.renderer.draw(surface, camera)
+
+    def _draw_text_from_value(self, obj, content):
+        """Render text based on TMX object properties."""
         try:
             # Color and font size (can be adjusted or fetched from properties)
             color = (85, 255, 255) # #55ffff
             size = 20
             
-            font = pygame.font.SysFont("Arial", size, bold=True)
-            text_surf = font.render(str(content), True, color)
-            
-            # Draw to map surface
-            surface.blit(text_surf, (obj.x, obj.y))
+            text_surf = text.render(("Arial", size, True), str(content), color)
             print(f"✅ [ID {obj.id}] Text rendered: {content}")
+            return text_surf
             
         except Exception as e:
             print(f"❌ [ID {obj.id}] Render failed: {e}")
+            return None
 
-    def _load_objects_from_layer(self, layer_name):
-        rect_list = []
-        try:
-            obj_layer = self.tmx_data.get_layer_by_name(layer_name)
-            for obj in obj_layer:
-                rect_list.append(pygame.Rect(obj.x, obj.y, obj.width, obj.height))
-        except:
-            pass
-        return rect_list
+    def nav_graph(self, speed, size=(TILE_SIZE, TILE_SIZE)):
+        """Platform navigation graph for enemies of `size` moving at `speed` (cached)."""
+        key = (speed, size)
+        graph = self.nav_graphs.get(key)
+        if graph is None:
+            graph = self.nav_graphs[key] = build_nav_graph(self.walls, speed, size, self.level_id)
+        return graph
 
-    def _load_level_data(self, level_id):
-        try:
-            with open(resource_path(LEVEL_DATA_PATH), 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            lv = data.get(level_id, {})
-            return lv.get("player_spawn", [0,0]), lv.get("destination"), lv.get("enemies", []), lv.get("props", [])
-        except Exception:
-            return [0,0], None, [], []
\ No newline at end of file
+    def reset_broadphase_stats(self):
+        for index in (self.wall_index, self.hazard_index, self.bouncer_index):
+            index.reset_stats()
+
+    def broadphase_stats(self):
+        """Returns (candidate rects tested, rects a linear scan would test)."""
+        tested = naive = 0
+        for index in (self.wall_index, self.hazard_index, self.bouncer_index):
+            tested += index.tested
+            naive += index.queries * len(index)
+        return tested, naive
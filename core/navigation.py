@@ -0,0 +1,276 @@
+import heapq
+import math
+import time
+from collections import OrderedDict
+import pygame
+from settings import NAV_PATH_CACHE_SIZE, NAV_JUMP_SAMPLE
+from core.spatial import SpatialHash
+from sprites.enemy import GRAVITY, MAX_FALL_SPEED, JUMP_STRENGTH
+
+# Link kinds
+WALK = "walk"  # Across a gap narrower than the body: always supported
+DROP = "drop"  # Walk off an edge and fall
+JUMP = "jump"  # Jump from a take-off point
+
+MAX_FLIGHT = 240  # Frames a simulated drop/jump may take before it is discarded
+
+
+class Link:
+    """One way from a platform to another.
+
+    x: the body's rect.x to start from (jumps must start exactly there;
+    walks and drops just head that way), direction: -1 / 1, cost: frames.
+    """
+
+    __slots__ = ("src", "dst", "kind", "x", "direction", "cost")
+
+    def __init__(self, src, dst, kind, x, direction, cost):
+        self.src = src
+        self.dst = dst
+        self.kind = kind
+        self.x = x
+        self.direction = direction
+        self.cost = cost
+
+    def __repr__(self):
+        return f"Link({self.src}->{self.dst} {self.kind} x={self.x} dir={self.direction} cost={self.cost:.0f})"
+
+
+def _union(spans):
+    """Merge touching/overlapping (left, right) spans."""
+    out = []
+    for left, right in sorted(spans):
+        if out and left <= out[-1][1]:
+            out[-1][1] = max(out[-1][1], right)
+        else:
+            out.append([left, right])
+    return out
+
+
+def _subtract(span, holes):
+    """Parts of `span` not covered by any of `holes`."""
+    parts = [span]
+    for h_left, h_right in holes:
+        parts = [piece for left, right in parts
+                 for piece in ((left, min(right, h_left)), (max(left, h_right), right))
+                 if piece[0] < piece[1]]
+    return parts
+
+
+def find_platforms(walls, size):
+    """Walkable surfaces for a body of `size`: (left, right, y), sorted by y then x.
+
+    A surface is the top of the (merged) wall rects at one height, minus the
+    stretches where something solid sits less than a body height above it;
+    stretches narrower than the body are dropped.
+    """
+    w, h = size
+    tops = {}
+    for r in walls:
+        tops.setdefault(r.top, []).append((r.left, r.right))
+    platforms = []
+    for y, spans in sorted(tops.items()):
+        blocked = [(r.left, r.right) for r in walls if r.top < y and r.bottom > y - h]
+        for surface in _union(spans):
+            for left, right in _subtract(tuple(surface), blocked):
+                if right - left >= w:
+                    platforms.append((left, right, y))
+    return platforms
+
+
+class NavGraph:
+    """Platform graph of one level for one enemy size and speed.
+
+    Built once (TiledMap.nav_graph): platforms are the nodes, links are found
+    by simulating the enemy's own movement (GRAVITY, MAX_FALL_SPEED and
+    JUMP_STRENGTH from sprites/enemy.py, int-truncated steps, first wall
+    hit wins) from every edge and from take-off points NAV_JUMP_SAMPLE px
+    apart. A link exists only if that simulation lands on the other platform.
+
+    path(start, goal) runs A* over the links; results, including "no path",
+    are kept in an LRU cache keyed by (start node, goal node).
+    """
+
+    def __init__(self, walls, speed, size):
+        self.walls = [r for r in walls if r.width > 0 and r.height > 0]
+        self.index = SpatialHash(self.walls)
+        self.speed = speed
+        # Pixels actually moved per frame: rect.x = int(x ± speed) truncates toward
+        # zero, so (at x >= 0) a step right is floor(speed) and a step left ceil(speed)
+        self.step_right = max(1, math.floor(speed))
+        self.step_left = math.ceil(speed)
+        self.size = size
+        self.platforms = find_platforms(self.walls, size)
+        self._by_y = {}
+        for node, (_, _, y) in enumerate(self.platforms):
+            self._by_y.setdefault(y, []).append(node)
+
+        self.links = [[] for _ in self.platforms]
+        for node in range(len(self.platforms)):
+            self._find_links(node)
+
+        # A* heuristic speed: the fastest a link gets from one platform middle to
+        # the next (a wall hit snaps the body sideways, faster than any walk)
+        self._middle = [(left + right) / 2 for left, right, _ in self.platforms]
+        self.reach = max([self.step_left, self.step_right] +
+                         [abs(self._middle[link.dst] - self._middle[link.src]) / link.cost
+                          for links in self.links for link in links])
+
+        self.path_cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def step_toward(self, dx):
+        """Pixels moved per frame when walking `dx` px (the sign picks the direction)."""
+        return self.step_right if dx > 0 else self.step_left
+
+    def walk_frames(self, dx):
+        """Frames needed to walk `dx` px."""
+        return abs(dx) / self.step_toward(dx)
+
+    def link_count(self):
+        return sum(len(links) for links in self.links)
+
+    def node_at(self, rect):
+        """Platform `rect` stands on (bottom on the surface, overlapping it), or None."""
+        for node in self._by_y.get(rect.bottom, ()):
+            left, right, _ = self.platforms[node]
+            if rect.left < right and left < rect.right:
+                return node
+        return None
+
+    # --- Building ---
+
+    def _blocked(self, rect):
+        return any(rect.colliderect(wall) for wall in self.index.query(rect))
+
+    def _fly(self, x, y, direction, vy):
+        """Simulate the enemy from rect (x, y) heading `direction` with vertical speed `vy`.
+
+        Mirrors Enemy._step (minus patrol turns): returns (node landed on,
+        rect.x on landing, frames), or None if it lands nowhere walkable.
+        """
+        w, h = self.size
+        rect = pygame.Rect(x, y, w, h)
+        for frame in range(1, MAX_FLIGHT):
+            if frame > 1:
+                vy = min(vy + GRAVITY, MAX_FALL_SPEED)
+            rect.x = int(rect.x + direction * self.speed)
+            for wall in self.index.query(rect):
+                if rect.colliderect(wall):
+                    direction *= -1
+                    if direction > 0:
+                        rect.right = wall.left
+                    else:
+                        rect.left = wall.right
+                    break
+            rect.y = int(rect.y + vy)
+            for wall in self.index.query(rect):
+                if rect.colliderect(wall):
+                    if vy > 0:
+                        rect.bottom = wall.top
+                        node = self.node_at(rect)
+                        return None if node is None else (node, rect.x, frame)
+                    rect.top = wall.bottom
+                    vy = 0
+                    break
+        return None
+
+    def _add(self, best, src, kind, x, direction, landed):
+        if landed is None:
+            return
+        dst, land_x, frames = landed
+        if dst == src:
+            return
+        left, right, _ = self.platforms[dst]
+        # Air time, plus walking from the landing spot to the middle of the target
+        cost = frames + self.walk_frames((left + right) / 2 - (land_x + self.size[0] / 2))
+        key = (dst, kind)
+        if key not in best or cost < best[key].cost:
+            best[key] = Link(src, dst, kind, x, direction, cost)
+
+    def _find_links(self, src):
+        w, h = self.size
+        left, right, y = self.platforms[src]
+        top = y - h
+        best = {}
+
+        # Walking off either edge: a walk if a neighbour catches the body at once, else a drop
+        for x, direction in ((left - w, -1), (right, 1)):
+            if not self._blocked(pygame.Rect(x, top, w, h)):
+                landed = self._fly(x, top, direction, GRAVITY)
+                kind = WALK if landed and self.platforms[landed[0]][2] == y and landed[2] <= 2 else DROP
+                self._add(best, src, kind, x, direction, landed)
+
+        # Jumps from take-off points along the platform, both ways
+        takeoffs = list(range(left - w + 1, right, NAV_JUMP_SAMPLE)) + [right - 1]
+        for x in takeoffs:
+            for direction in (-1, 1):
+                self._add(best, src, JUMP, x, direction, self._fly(x, top, direction, JUMP_STRENGTH))
+
+        # Walking to the take-off point first is part of the price
+        middle = (left + right - w) / 2
+        for link in best.values():
+            link.cost += self.walk_frames(link.x - middle)
+        self.links[src] = sorted(best.values(), key=lambda link: link.cost)
+
+    # --- Queries ---
+
+    def _estimate(self, node, goal):
+        """Frames at least needed: middle-to-middle distance at the fastest link's pace.
+
+        Link costs run from middle to middle, so this never overestimates
+        (and is consistent: the distance obeys the triangle inequality).
+        """
+        return abs(self._middle[goal] - self._middle[node]) / self.reach
+
+    def path(self, start, goal):
+        """Links from platform `start` to `goal` ((): already there, None: unreachable)."""
+        key = (start, goal)
+        cache = self.path_cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            return cache[key]
+        self.misses += 1
+        result = self._search(start, goal)
+        cache[key] = result
+        if len(cache) > NAV_PATH_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+
+    def _search(self, start, goal):
+        if start == goal:
+            return ()
+        came_from = {start: None}
+        cost = {start: 0.0}
+        frontier = [(self._estimate(start, goal), 0, start)]
+        order = 1  # Tie-breaker: heapq never compares nodes of equal priority
+        while frontier:
+            _, _, node = heapq.heappop(frontier)
+            if node == goal:
+                links = []
+                while came_from[node] is not None:
+                    link = came_from[node]
+                    links.append(link)
+                    node = link.src
+                return tuple(reversed(links))
+            for link in self.links[node]:
+                new_cost = cost[node] + link.cost
+                if new_cost < cost.get(link.dst, float("inf")):
+                    cost[link.dst] = new_cost
+                    came_from[link.dst] = link
+                    heapq.heappush(frontier, (new_cost + self._estimate(link.dst, goal), order, link.dst))
+                    order += 1
+        return None
+
+
+def build_nav_graph(walls, speed, size, level_id=""):
+    start = time.perf_counter()
+    graph = NavGraph(walls, speed, size)
+    print(f"[{level_id}] Nav graph ({speed} px/frame): {len(graph)} platforms, {graph.link_count()} links "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return graph
@@ -0,0 +1,160 @@
+import math
+import numpy as np
+import pygame
+
+# Frame selection modes
+BY_ANGLE = "angle"  # Rotating sprites: frame from the particle's angle
+BY_AGE = "age"      # Fading sprites: frame from age / lifetime
+
+
+def polygon_strip(sides, size, color, frames, width=2):
+    """Pre-rotated outline polygons covering one symmetry period (360 / sides).
+
+    Replaces per-frame cos/sin + draw.polygon with a frame lookup.
+    """
+    radius = size // 2
+    dim = size + width * 2
+    period = 360 / sides
+    strip = []
+    key = (0, 0, 0) if tuple(color[:3]) != (0, 0, 0) else (255, 0, 255)
+    for i in range(frames):
+        # Hard-edged outline: an RLE colorkey skips the empty interior on blit
+        surf = pygame.Surface((dim, dim))
+        surf.fill(key)
+        surf.set_colorkey(key, pygame.RLEACCEL)
+        base = i * period / frames
+        points = [(dim / 2 + math.cos(math.radians(base + j * 360 / sides)) * radius,
+                   dim / 2 + math.sin(math.radians(base + j * 360 / sides)) * radius)
+                  for j in range(sides)]
+        pygame.draw.polygon(surf, color, points, width)
+        strip.append(surf)
+    return tuple(strip)
+
+
+def fade_strip(size, color, frames):
+    """A filled square fading from opaque to transparent over `frames` steps."""
+    strip = []
+    for i in range(frames):
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        surf.fill((*color[:3], 255 - 255 * i // frames))
+        strip.append(surf)
+    return tuple(strip)
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as NumPy arrays (one row per slot).
+
+    Position, velocity, angle, spin, age and lifetime live in parallel arrays
+    and are stepped with vectorized operations; nothing is allocated per
+    particle. Drawing picks a pre-baked frame per particle and submits them in
+    a single Surface.blits call.
+
+    strips:   one tuple of frames per particle kind, all the same length
+    frame_by: BY_ANGLE (frames span `period` degrees) or BY_AGE
+    gravity:  added to vel.y every update
+    wrap:     (w, h) area; particles leaving it reappear on the opposite side
+    """
+
+    def __init__(self, strips, capacity, frame_by=BY_AGE, period=360.0, gravity=0.0, wrap=None):
+        self.strips = strips
+        self.frame_count = len(strips[0])
+        self.frame_by = frame_by
+        self.period = period
+        self.gravity = gravity
+        self.wrap = wrap
+        # Per-kind sprite half size: positions are particle centres
+        self.half = np.array([[s[0].get_width() // 2, s[0].get_height() // 2] for s in strips])
+
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.angle = np.zeros(capacity)
+        self.spin = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.intp)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def emit(self, pos, vel, kind=0, life=np.inf, angle=0.0, spin=0.0):
+        """Spawn one particle per row of `vel` (other arguments broadcast).
+
+        Returns how many were spawned; extra particles are dropped when the
+        pool is full.
+        """
+        vel = np.atleast_2d(vel)
+        slots = np.flatnonzero(~self.alive)[:len(vel)]
+        n = len(slots)
+        if n:
+            self.pos[slots] = np.broadcast_to(pos, (len(vel), 2))[:n]
+            self.vel[slots] = vel[:n]
+            self.kind[slots] = np.broadcast_to(kind, len(vel))[:n]
+            self.life[slots] = np.broadcast_to(life, len(vel))[:n]
+            self.angle[slots] = np.broadcast_to(angle, len(vel))[:n]
+            self.spin[slots] = np.broadcast_to(spin, len(vel))[:n]
+            self.age[slots] = 0
+            self.alive[slots] = True
+        return n
+
+    def burst(self, pos, count, speed, rng, kind=0, life=30, spin=0.0):
+        """Emit `count` particles from `pos` in random directions (explosions)."""
+        theta = rng.uniform(0, 2 * math.pi, count)
+        r = rng.uniform(0.3, 1.0, count) * speed
+        vel = np.column_stack((np.cos(theta) * r, np.sin(theta) * r))
+        return self.emit(pos, vel, kind, life, rng.uniform(0, 360, count), spin)
+
+    def clear(self):
+        self.alive[:] = False
+
+    def update(self):
+        alive = self.alive
+        if not alive.any():
+            return
+        self.vel[alive, 1] += self.gravity
+        self.pos[alive] += self.vel[alive]
+        self.angle[alive] += self.spin[alive]
+        self.age[alive] += 1
+        alive &= self.age < self.life
+
+        if self.wrap:
+            w, h = self.wrap
+            for axis, extent in ((0, w), (1, h)):
+                margin = self.half[self.kind, axis]
+                coord = self.pos[:, axis]
+                span = extent + 2 * margin
+                low = coord < -margin
+                high = coord > extent + margin
+                coord[low] += span[low]
+                coord[high] -= span[high]
+
+    def _frames(self, idx):
+        if self.frame_by == BY_ANGLE:
+            f = (self.angle[idx] % self.period) * (self.frame_count / self.period)
+        else:
+            f = self.age[idx] * (self.frame_count / self.life[idx])
+        return np.minimum(f.astype(np.intp), self.frame_count - 1)
+
+    def draw(self, surface, offset=(0, 0)):
+        """Blit live particles; offset is subtracted (camera). Returns the bounding rect or None."""
+        idx = np.flatnonzero(self.alive)
+        if not len(idx):
+            return None
+        kinds = self.kind[idx]
+        tl = (self.pos[idx] - self.half[kinds] - offset).astype(int)
+        frames = self._frames(idx)
+        strips = self.strips
+        surface.blits([(strips[k][f], (x, y)) for k, f, (x, y)
+                       in zip(kinds.tolist(), frames.tolist(), tl.tolist())], doreturn=False)
+        return self.bounds(offset)
+
+    def bounds(self, offset=(0, 0)):
+        """Screen rect covering every live particle, or None."""
+        idx = np.flatnonzero(self.alive)
+        if not len(idx):
+            return None
+        half = self.half[self.kind[idx]]
+        pos = self.pos[idx] - offset
+        x0, y0 = np.floor((pos - half).min(axis=0)).astype(int) - 1
+        x1, y1 = np.ceil((pos + half).max(axis=0)).astype(int) + 1
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
@@ -1,43 +1,70 @@
 import pygame
 from settings import WIDTH, HEIGHT
+from core import text
+
+TITLE_FONT = ("Verdana", 50, True)
+BTN_FONT = ("Verdana", 30, True)
 
 
 class PauseMenu:
+    """Pause screen drawn over a frozen game frame.
+
+    `freeze()` bakes the game frame, dim overlay and title into one backdrop
+    when pausing; afterwards `draw()` only repaints a button when its hover
+    state changes.
+    """
+
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.SysFont("Verdana", 50, bold=True)
-        self.btn_font = pygame.font.SysFont("Verdana", 30, bold=True)
-
         # Define buttons
         self.resume_rect = pygame.Rect(WIDTH // 2 - 120, HEIGHT // 2 - 40, 240, 60)
         self.menu_rect = pygame.Rect(WIDTH // 2 - 120, HEIGHT // 2 + 50, 240, 60)
+        self.buttons = [
+            (self.resume_rect, "RESUME", (45, 180, 110)),
+            (self.menu_rect, "MAIN MENU", (180, 45, 45)),
+        ]
 
-    def draw(self):
-        # 1. Draw semi-transparent overlay to darken game screen
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        # Semi-transparent overlay to darken the game screen
+        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 180))
+        self.backdrop = None
+        self.hover = None  # Hover state per button as last drawn
 
-        # 2. Draw "PAUSED" text
-        title_surf = self.font.render("PAUSED", True, (255, 255, 255))
-        self.screen.blit(title_surf, title_surf.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 120)))
+    def freeze(self, frame):
+        """Bake the paused backdrop from the current game frame."""
+        self.backdrop = frame.copy()
+        self.backdrop.blit(self.overlay, (0, 0))
+        title_surf = text.render(TITLE_FONT, "PAUSED", (255, 255, 255))
+        self.backdrop.blit(title_surf, title_surf.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 120)))
+        self.hover = None
 
-        # 3. Draw buttons
+    def draw(self):
+        """Repaint what changed. Returns the changed rects, or None after a full redraw."""
         mouse_pos = pygame.mouse.get_pos()
+        hover = [rect.collidepoint(mouse_pos) for rect, _, _ in self.buttons]
+        if hover == self.hover:
+            return []
 
-        for rect, text, color in [
-            (self.resume_rect, "RESUME", (45, 180, 110)),
-            (self.menu_rect, "MAIN MENU", (180, 45, 45))
-        ]:
-            is_hover = rect.collidepoint(mouse_pos)
+        full = self.hover is None
+        if full:
+            self.screen.blit(self.backdrop, (0, 0))
+        changed = []
+        for (rect, label, color), is_hover, was_hover in zip(self.buttons, hover, self.hover or hover):
+            if not full and is_hover == was_hover:
+                continue
+            if not full:
+                self.screen.blit(self.backdrop, rect, rect)
             # Highlight on hover
             draw_color = [min(c + 40, 255) if is_hover else c for c in color]
 
             pygame.draw.rect(self.screen, draw_color, rect, border_radius=5)
             pygame.draw.rect(self.screen, (255, 255, 255), rect, 2, border_radius=5)
 
-            txt_surf = self.btn_font.render(text, True, (255, 255, 255))
+            txt_surf = text.render(BTN_FONT, label, (255, 255, 255))
             self.screen.blit(txt_surf, txt_surf.get_rect(center=rect.center))
+            changed.append(rect)
+        self.hover = hover
+        return None if full else changed
 
     def handle_input(self, event):
         """Returns state string to tell main.py what to do"""
@@ -46,4 +73,4 @@ class PauseMenu:
                 return "RESUME"
             if self.menu_rect.collidepoint(event.pos):
                 return "MAIN_MENU"
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,104 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from settings import PRELOAD_POOL_SIZE, PRELOAD_BUDGET_MS
+from core.maploader import TiledMap, parse_level
+
+
+def level_file(lv_num):
+    return f"assets/map/lv{lv_num}.tmx"
+
+
+class LevelPreloader:
+    """Prepares levels while the menu is showing so picking one is instant.
+
+    A worker thread does the file reads, XML parsing and rect extraction
+    (parse_level). Surface creation stays on the main thread: `pump()` is
+    called once per menu frame and advances the staged TiledMap builds for at
+    most `budget_ms`. Finished maps wait in a bounded LRU pool; `take()` hands
+    one out and `release()` gives it back when the player returns to the menu.
+    """
+
+    def __init__(self, levels, pool_size=PRELOAD_POOL_SIZE):
+        self.pool_size = pool_size
+        self.pool = OrderedDict()    # lv_num -> ready TiledMap
+        self.building = {}           # lv_num -> (TiledMap, steps)
+        self.pending = set(levels)   # Queued for / being parsed on the worker
+        self.failed = set()
+
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="level-preloader", daemon=True)
+        self._worker.start()
+        for lv_num in levels:
+            self._jobs.put(("parse", lv_num))
+
+    def _run(self):
+        while True:
+            kind, arg = self._jobs.get()
+            if kind == "write":
+                arg()  # Compiled cache write handed back by a build
+                continue
+            try:
+                self._results.put((arg, parse_level(level_file(arg)), None))
+            except Exception as e:
+                self._results.put((arg, None, e))
+
+    def _write_later(self, write):
+        self._jobs.put(("write", write))
+
+    def _collect(self, wait=False):
+        """Turn finished worker parses into staged builds (wait: block for one)."""
+        while True:
+            try:
+                lv_num, parsed, error = self._results.get(block=wait)
+            except queue.Empty:
+                return
+            wait = False
+            self.pending.discard(lv_num)
+            if error:
+                print(f"Preload of lv{lv_num} failed: {error}")
+                self.failed.add(lv_num)
+            else:
+                self.building[lv_num] = TiledMap.staged(parsed, self._write_later)
+
+    def _finish(self, lv_num):
+        tiled_map, steps = self.building.pop(lv_num)
+        for _ in steps:
+            pass
+        self._store(lv_num, tiled_map)
+
+    def _store(self, lv_num, tiled_map):
+        self.pool[lv_num] = tiled_map
+        self.pool.move_to_end(lv_num)
+        while len(self.pool) > self.pool_size:
+            self.pool.popitem(last=False)
+
+    def pump(self, budget_ms=PRELOAD_BUDGET_MS):
+        """Advance staged builds on the main thread for up to budget_ms."""
+        self._collect()
+        deadline = time.perf_counter() + budget_ms / 1000
+        while self.building and time.perf_counter() < deadline:
+            lv_num = next(iter(self.building))
+            tiled_map, steps = self.building[lv_num]
+            if next(steps, StopIteration) is StopIteration:
+                del self.building[lv_num]
+                self._store(lv_num, tiled_map)
+
+    def take(self, lv_num):
+        """Ready map for a level, or None if it was never preloaded (or failed).
+
+        A level still in flight is finished synchronously; that is never
+        slower than loading it from scratch.
+        """
+        while lv_num in self.pending:
+            self._collect(wait=True)
+        if lv_num in self.building:
+            self._finish(lv_num)
+        return self.pool.pop(lv_num, None)
+
+    def release(self, lv_num, tiled_map):
+        """Return a map to the pool once its level is left."""
+        if tiled_map is not None:
+            self._store(lv_num, tiled_map)
@@ -0,0 +1,97 @@
+import contextlib
+import csv
+import json
+import os
+import time
+import numpy as np
+from settings import PROFILE_FRAMES, PROFILE_DIR
+
+# Named timing scopes, in overlay/export order. The first five are the
+# scheduler phases; the rest are render stages and presenting the frame.
+SCOPES = ("input", "physics", "collision", "triggers", "animation",
+          "map", "sprites", "lights", "hud", "present")
+
+_NULL = contextlib.nullcontext()
+
+
+class _Scope:
+    __slots__ = ("times", "index", "start")
+
+    def __init__(self, times, index):
+        self.times = times
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.times[self.index] += time.perf_counter() - self.start
+
+
+class Profiler:
+    """Per-frame timing scopes with a rolling history.
+
+    `with profiler.scope("map"): ...` adds to the current frame's "map" time
+    (a scope may run several times per frame, e.g. once per dirty rect);
+    `end_frame()` moves the frame into a ring buffer of PROFILE_FRAMES rows.
+    While disabled, scope() hands back a shared no-op context and nothing is
+    recorded.
+    """
+
+    def __init__(self, capacity=PROFILE_FRAMES, scopes=SCOPES):
+        self.enabled = False
+        self.scopes = scopes
+        self.capacity = capacity
+        self.current = [0.0] * len(scopes)
+        self._scopes = {name: _Scope(self.current, i) for i, name in enumerate(scopes)}
+        self._index = {name: i for i, name in enumerate(scopes)}
+        # One row per frame: scope seconds..., then wall-clock frame time
+        self.samples = np.zeros((capacity, len(scopes) + 1))
+        self.count = 0
+        self._last_end = None
+
+    def scope(self, name):
+        return self._scopes[name] if self.enabled else _NULL
+
+    def add(self, name, seconds):
+        """Record time measured elsewhere (e.g. scheduler phases)."""
+        if self.enabled:
+            self.current[self._index[name]] += seconds
+
+    def end_frame(self):
+        if not self.enabled:
+            self._last_end = None
+            return
+        now = time.perf_counter()
+        row = self.samples[self.count % self.capacity]
+        row[:-1] = self.current
+        row[-1] = now - self._last_end if self._last_end is not None else 0.0
+        self._last_end = now
+        self.count += 1
+        for i in range(len(self.current)):
+            self.current[i] = 0.0
+
+    def history(self):
+        """Recorded rows, oldest first."""
+        if self.count <= self.capacity:
+            return self.samples[:self.count]
+        split = self.count % self.capacity
+        return np.concatenate((self.samples[split:], self.samples[:split]))
+
+    def dump(self, directory=PROFILE_DIR):
+        """Write the buffer as CSV and JSON (milliseconds). Returns both paths."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime("frames-%Y%m%d-%H%M%S"))
+        rows = (self.history() * 1000).round(4).tolist()
+        header = list(self.scopes) + ["frame"]
+        first = self.count - len(rows)
+
+        with open(base + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["index"] + header)
+            for i, row in enumerate(rows):
+                writer.writerow([first + i] + row)
+        with open(base + ".json", "w") as f:
+            json.dump({"unit": "ms", "first_index": first, "columns": header, "frames": rows}, f)
+        return base + ".csv", base + ".json"
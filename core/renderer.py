@@ -0,0 +1,60 @@
+import pygame
+
+
+def merge_overlapping(rects):
+    """Union overlapping rects so no pixel is processed twice in one frame."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRenderer:
+    """Dirty-rectangle presenter for the PLAYING state.
+
+    Each frame the game reports its "live" rects (light holes, moving sprites,
+    HUD). Only the union of this frame's and last frame's live rects is
+    recomposed, under a clip, and handed to pygame.display.update(). Any
+    change of scene key (level, cleared, debug) forces one full redraw.
+    """
+
+    def __init__(self):
+        self.prev_rects = []
+        self.scene_key = None
+        self.full_redraw = True
+
+        # Stats of the last frame (debug overlay)
+        self.rect_count = 0
+        self.pixel_area = 0
+
+    def invalidate(self):
+        """Screen content was drawn by someone else: redraw everything next frame."""
+        self.full_redraw = True
+
+    def render(self, screen, compose, live_rects, scene_key):
+        screen_rect = screen.get_rect()
+        if self.full_redraw or scene_key != self.scene_key:
+            rects = [screen_rect]
+            self.full_redraw = False
+        else:
+            rects = [r.clip(screen_rect) for r in merge_overlapping(self.prev_rects + live_rects)]
+            rects = [r for r in rects if r.w and r.h]
+        self.prev_rects = live_rects
+        self.scene_key = scene_key
+
+        for rect in rects:
+            screen.set_clip(rect)
+            compose(screen)
+        screen.set_clip(None)
+
+        self.rect_count = len(rects)
+        self.pixel_area = sum(r.w * r.h for r in rects)
+        return rects
@@ -0,0 +1,58 @@
+import struct
+import zlib
+
+# File layout: header, level id (utf-8), then one zlib-compressed byte per frame
+MAGIC = b"INKR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBI")  # magic, version, level id length, frame count
+
+
+class InputRecorder:
+    """Collects per-frame input bitmasks for one level run."""
+
+    def __init__(self, level_id):
+        self.level_id = level_id
+        self.frames = bytearray()
+
+    def record(self, mask):
+        self.frames.append(mask & 0xFF)
+
+    def save(self, path):
+        level = self.level_id.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(level), len(self.frames)))
+            f.write(level)
+            f.write(zlib.compress(bytes(self.frames), 9))
+        print(f"Recorded {len(self.frames)} frames of {self.level_id} -> {path}")
+
+
+class Replay:
+    """A loaded recording; iterating yields the input bitmask for each frame."""
+
+    def __init__(self, level_id, frames):
+        self.level_id = level_id
+        self.frames = bytes(frames)
+
+    @property
+    def level_num(self):
+        return int(self.level_id[2:])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self):
+        return iter(self.frames)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, level_len, count = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not an input recording (v{VERSION})")
+        offset = _HEADER.size
+        level_id = data[offset:offset + level_len].decode("utf-8")
+        frames = zlib.decompress(data[offset + level_len:])
+        if len(frames) != count:
+            raise ValueError(f"{path}: truncated recording ({len(frames)}/{count} frames)")
+        return cls(level_id, frames)
@@ -0,0 +1,66 @@
+import time
+
+# Phases, in the order they run every frame
+INPUT = "input"
+PHYSICS = "physics"
+COLLISION = "collision"
+TRIGGERS = "triggers"
+ANIMATION = "animation"
+PHASES = (INPUT, PHYSICS, COLLISION, TRIGGERS, ANIMATION)
+
+
+class System:
+    """One per-frame job: `run()` with whatever arguments it binds itself.
+
+    groups: names of the entity sets it steps (documentation and debug
+    listing; the scheduler does not iterate them for the system).
+    """
+
+    __slots__ = ("phase", "name", "run", "groups")
+
+    def __init__(self, phase, name, run, groups=()):
+        if phase not in PHASES:
+            raise ValueError(f"Unknown phase {phase!r}")
+        self.phase = phase
+        self.name = name
+        self.run = run
+        self.groups = tuple(groups)
+
+
+class Scheduler:
+    """Runs systems phase by phase, each exactly once per frame.
+
+    `timings` holds the wall-clock seconds of every phase in the last frame.
+    `halt()` (e.g. after a level reset mid-frame) skips the remaining systems.
+    """
+
+    def __init__(self):
+        self.systems = {phase: [] for phase in PHASES}
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self._halted = False
+
+    def add(self, phase, name, run, groups=()):
+        system = System(phase, name, run, groups)
+        self.systems[phase].append(system)
+        return system
+
+    def halt(self):
+        self._halted = True
+
+    def run(self):
+        self._halted = False
+        timings = self.timings
+        for phase in PHASES:
+            if self._halted:
+                timings[phase] = 0.0
+                continue
+            start = time.perf_counter()
+            for system in self.systems[phase]:
+                system.run()
+                if self._halted:
+                    break
+            timings[phase] = time.perf_counter() - start
+
+    def describe(self):
+        """[(phase, system name, groups)] in run order."""
+        return [(s.phase, s.name, s.groups) for phase in PHASES for s in self.systems[phase]]
@@ -0,0 +1,69 @@
+import math
+import numpy as np
+import pygame
+from core.spatial import SpatialHash
+
+# Extra rays either side of every corner (radians) so light slips past it
+CORNER_SPREAD = 1e-4
+
+
+class Occluders:
+    """Wall outlines as line segments, for 2D line of sight.
+
+    Built once per level from the collision rects: four edges per rect, each
+    with its outward normal, plus a SpatialHash over the rects so a light
+    only looks at the walls inside its radius.
+    """
+
+    def __init__(self, rects):
+        rects = [r for r in rects if r.width > 0 and r.height > 0]
+        self.index = SpatialHash(rects)
+        edges = []
+        for r in rects:
+            left, top, right, bottom = r.left, r.top, r.right, r.bottom
+            edges += [
+                (left, top, right, top, 0, -1),
+                (right, top, right, bottom, 1, 0),
+                (right, bottom, left, bottom, 0, 1),
+                (left, bottom, left, top, -1, 0),
+            ]
+        # x1, y1, x2, y2, normal x, normal y; rect i owns rows 4i .. 4i+3
+        self.edges = np.array(edges, dtype=np.float64).reshape(-1, 6)
+
+    def __len__(self):
+        return len(self.edges)
+
+    def visibility(self, origin, radius, depth=0):
+        """What `origin` sees within `radius` (a square bound), as a polygon.
+
+        Rays are cast at every segment corner in range (and just either side
+        of it); each stops at the nearest segment, then runs on `depth`
+        pixels so the faces it lands on are lit too. Returns the end points
+        as an (n, 2) array of world coordinates, sorted by angle.
+        """
+        ox, oy = origin
+        area = pygame.Rect(ox - radius, oy - radius, radius * 2, radius * 2)
+        rows = np.array(self.index.query_indices(area), dtype=np.intp)
+        edges = self.edges[(rows[:, None] * 4 + np.arange(4)).ravel()]
+        # A ray from outside a rect always meets a face turned towards it first
+        facing = (ox - edges[:, 0]) * edges[:, 4] + (oy - edges[:, 1]) * edges[:, 5] > 0
+        x0, y0, x1, y1 = area.left, area.top, area.right, area.bottom
+        bound = np.array([(x0, y0, x1, y0), (x1, y0, x1, y1), (x1, y1, x0, y1), (x0, y1, x0, y0)],
+                         dtype=np.float64)
+        segments = np.vstack((edges[facing, :4], bound))
+
+        start = segments[:, :2] - origin
+        span = segments[:, 2:] - segments[:, :2]
+        corners = np.vstack((start, start + span))
+        angles = np.unique(np.arctan2(corners[:, 1], corners[:, 0]))
+        angles = (angles[:, None] + (-CORNER_SPREAD, 0.0, CORNER_SPREAD)).ravel()
+        dx, dy = np.cos(angles)[:, None], np.sin(angles)[:, None]
+
+        # Ray origin + t * d meets segment start + u * span, for every ray × segment
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = dx * span[:, 1] - dy * span[:, 0]
+            t = (start[:, 0] * span[:, 1] - start[:, 1] * span[:, 0]) / denom
+            u = (start[:, 0] * dy - start[:, 1] * dx) / denom
+            hit = (denom != 0) & (t >= 0) & (u >= 0) & (u <= 1)
+        t = np.where(hit, t, math.inf).min(axis=1) + depth  # The bound is always hit
+        return np.column_stack((ox + dx[:, 0] * t, oy + dy[:, 0] * t))
@@ -0,0 +1,73 @@
+from settings import SPATIAL_CELL_SIZE
+
+
+class SpatialHash:
+    """Uniform grid broadphase over a static list of rects.
+
+    Built once per level. `query` returns the candidate rects touching an
+    area in their original list order, so collision code that relies on
+    "first hit wins" behaves exactly like a linear scan.
+    """
+
+    def __init__(self, rects, cell_size=SPATIAL_CELL_SIZE):
+        self.rects = list(rects)
+        self.cell_size = cell_size
+        self.cells = {}
+
+        for index, rect in enumerate(self.rects):
+            for cell in self._cells_for(rect):
+                self.cells.setdefault(cell, []).append(index)
+
+        # Debug counters (reset once per frame)
+        self.queries = 0
+        self.tested = 0
+
+    def __iter__(self):
+        return iter(self.rects)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        x0, y0 = rect.left // size, rect.top // size
+        # Rect edges are exclusive, so a rect ending on a cell border stays out of it
+        x1, y1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+        for cx in range(x0, max(x0, x1) + 1):
+            for cy in range(y0, max(y0, y1) + 1):
+                yield cx, cy
+
+    def query(self, rect):
+        """Return rects that may overlap `rect`, in insertion order."""
+        rects = self.rects
+        return [rects[i] for i in self.query_indices(rect)]
+
+    def query_indices(self, rect):
+        """Like query(), but the candidates' positions in `rects` (ascending)."""
+        self.queries += 1
+        cells = self.cells
+        found = None
+        single = None
+        for cell in self._cells_for(rect):
+            indices = cells.get(cell)
+            if not indices:
+                continue
+            if single is None and found is None:
+                single = indices
+            else:
+                if found is None:
+                    found = set(single)
+                found.update(indices)
+
+        if found is not None:
+            result = sorted(found)
+        elif single is not None:
+            result = single
+        else:
+            result = []
+        self.tested += len(result)
+        return result
+
+    def reset_stats(self):
+        self.queries = 0
+        self.tested = 0
@@ -0,0 +1,51 @@
+import pygame
+from collections import OrderedDict
+from settings import TEXT_CACHE_SIZE
+
+# Process-wide font registry and rendered-text LRU.
+# Fonts are named by (name, size, bold) tuples, e.g. ("Consolas", 24, True);
+# each is created once. Returned text surfaces are shared: treat as read-only.
+_fonts = {}
+_texts = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_font(font):
+    """The pygame Font for a (name, size, bold) tuple."""
+    f = _fonts.get(font)
+    if f is None:
+        name, size, bold = font
+        f = _fonts[font] = pygame.font.SysFont(name, size, bold=bold)
+    return f
+
+
+def render(font, text, color, antialias=True):
+    """Rendered `text`, reused while (font, text, color, antialias) stays the same."""
+    key = (font, text, tuple(color), antialias)
+    surf = _texts.get(key)
+    if surf is not None:
+        _stats["hits"] += 1
+        _texts.move_to_end(key)
+        return surf
+    _stats["misses"] += 1
+
+    surf = get_font(font).render(text, antialias, color)
+    _texts[key] = surf
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return surf
+
+
+def text_stats():
+    """Returns hit/miss counts, cached text surfaces and registered fonts."""
+    return {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "entries": len(_texts),
+        "fonts": len(_fonts),
+    }
+
+
+def clear_cache():
+    _texts.clear()
+    _stats.update(hits=0, misses=0)
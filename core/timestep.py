@@ -0,0 +1,39 @@
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation steps.
+
+    Every physics constant and timer in the game is counted per step, so the
+    simulation must advance at exactly `rate` steps per second of real time,
+    whatever rate the display renders at. `advance(dt)` returns how many steps
+    to run for a frame that took `dt` seconds; `alpha` is how far real time
+    has moved into the next step (0..1), for interpolating drawn positions.
+
+    max_steps caps the catch-up per frame (spiral-of-death guard): when a
+    frame runs late by more than that, the extra time is dropped and the game
+    slows down instead of stalling further behind on every frame.
+    """
+
+    def __init__(self, rate, max_steps):
+        self.step_time = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0  # Steps skipped by the guard since the last reset()
+
+    def reset(self):
+        """Forget pending time (after a pause, a menu or a level load)."""
+        self.accumulator = 0.0
+        self.dropped = 0
+
+    def advance(self, dt):
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step_time)
+        if steps > self.max_steps:
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator %= self.step_time  # Keep the phase, drop the backlog
+        else:
+            self.accumulator -= steps * self.step_time
+        return steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.step_time, 1.0)
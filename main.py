@@ -1,115 +1,61 @@
+import argparse
 import pygame
 import sys
-import settings
 from settings import *
-from core.maploader import TiledMap
-from sprites.player import Player
-from sprites.enemy import Enemy
-from sprites.prop import Prop
-from sprites.dest import Destination
-from core.light_manager import LightManager
+from core.game import Game
+from core.inputs import read_keyboard, RESET
 from core.level import LvSelect
-from core.debug import Debugger
 from core.pause import PauseMenu
+from core.preloader import LevelPreloader
+from core.replay import InputRecorder, Replay
+from core.timestep import FixedTimestep
+
+parser = argparse.ArgumentParser(description="Ink Ninja")
+parser.add_argument("--record", metavar="FILE", help="record inputs of the next level run to FILE")
+parser.add_argument("--replay", metavar="FILE", help="play back a recording instead of the keyboard")
+parser.add_argument("--fps", type=int, default=RENDER_FPS,
+                    help=f"display frame cap, 0 = uncapped (gameplay always steps at {FPS} Hz)")
+args = parser.parse_args()
 
 # --- 1. Init ---
 pygame.init()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Ink Ninja - Remastered")
 clock = pygame.time.Clock()
-font = pygame.font.SysFont("Arial", 64, bold=True)
 
-# --- 2. Globals & Groups ---
+# --- 2. Globals ---
 game_state = "LV_MENU" # States: LV_MENU / PLAYING / PAUSED
-death_count = 0
 lv_selector = LvSelect(screen)
 pause_menu = PauseMenu(screen)
-map_handler = None
-light_manager = None
-
-all_sprites = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-props_group = pygame.sprite.Group()
-dest_group = pygame.sprite.Group()
-
-player = None
-shield_timer = 0
-torch_timer = 0
-has_anti_explosion = False
-lv_cleared = False
-
-# View radius
-base_radius = PLAYER_LIGHT_RADIUS
-current_radius = base_radius
-target_radius = base_radius
-lerp_speed = 0.08
-
-def load_lv(lv_num):
-    """Load level by number."""
-    global map_handler, game_state
-    settings.TMX_FILE = f"assets/map/lv{lv_num}.tmx"
-    try:
-        map_handler = TiledMap(settings.TMX_FILE)
-        reset_lv_data()
-        game_state = "PLAYING"
-    except Exception as e:
-        print(f"Load failed: {e}")
-
-def reset_lv_data():
-    """Reset current level data."""
-    global player, shield_timer, torch_timer, has_anti_explosion, lv_cleared
-    global current_radius, target_radius, death_count
-    
-    # Clear groups
-    all_sprites.empty()
-    enemies.empty()
-    props_group.empty()
-    dest_group.empty()
-    
-    # Reset state
-    lv_cleared = False
-    shield_timer = 0
-    torch_timer = 0
-    has_anti_explosion = False
-    current_radius = base_radius
-    target_radius = base_radius
-
-    # Load map data
-    lv_id = settings.TMX_FILE.split('/')[-1].split('.')[0]
-    p_spawn, d_pos, e_list, p_list = map_handler._load_level_data(lv_id)
-
-    # 1. Destination
-    if d_pos:
-        goal = Destination(d_pos[0], d_pos[1])
-        dest_group.add(goal)
-        all_sprites.add(goal)
-
-    # 2. Player
-    player = Player(p_spawn[0], p_spawn[1])
-    all_sprites.add(player)
-
-    # 3. Enemies
-    for e in e_list:
-        new_enemy = Enemy(e["start_pos"][0], e["start_pos"][1], e["move_range"], e["speed"])
-        enemies.add(new_enemy)
-        all_sprites.add(new_enemy)
-
-    # 4. Props
-    for p in p_list:
-        new_prop = Prop(p["pos"][0], p["pos"][1], p["type"])
-        props_group.add(new_prop)
-        all_sprites.add(new_prop)
-    
-    print(f"--- {lv_id} Reset Complete ---")
-
-# Init light system
-light_manager = LightManager(base_radius)
+game = Game()
+recorder = None
+replay = None
+reset_requested = False
+preloader = LevelPreloader(range(1, 6))
+current_lv = None
+# Simulation runs in fixed 1/FPS steps, decoupled from the display rate
+timestep = FixedTimestep(FPS, MAX_CATCH_UP_STEPS)
+last_state = None
+
+if args.replay:
+    replay = Replay.load(args.replay)
+    if not game.load_level(replay.level_num):
+        sys.exit(f"Cannot replay {args.replay}: level {replay.level_id} failed to load")
+    replay_inputs = iter(replay)
+    game_state = "PLAYING"
 
 # --- 3. Main Loop ---
 running = True
 while running:
-    clock.tick(FPS)
+    # Nothing animates while paused: idle at a low rate
+    frame_time = clock.tick(PAUSED_FPS if game_state == "PAUSED" else args.fps) / 1000
+    # Time spent in the menu, a pause or a level load is not played out
+    if game_state != last_state:
+        timestep.reset()
+        frame_time = 0.0
+    last_state = game_state
     events = pygame.event.get()
+    dirty_rects = None
 
     for event in events:
         if event.type == pygame.QUIT:
@@ -117,128 +63,70 @@ while running:
 
     if game_state == "LV_MENU":
         # --- Menu Logic ---
+        # Hand the previous level's map back for an instant replay
+        if current_lv is not None:
+            preloader.release(current_lv, game.map_handler)
+            current_lv = None
         for event in events:
             selected_lv = lv_selector.handle_input(event)
-            if selected_lv:
-                load_lv(selected_lv)
+            if not selected_lv:
+                continue
+            tiled_map = preloader.take(selected_lv)
+            if not game.load_level(selected_lv, tiled_map):
+                preloader.release(selected_lv, tiled_map)  # Still good for the next try
+                continue
+            game_state = "PLAYING"
+            current_lv = selected_lv
+            reset_requested = False  # Never carry an R press into a new level
+            if args.record:
+                recorder = InputRecorder(game.level_id)
+            break
         lv_selector.draw()
+        preloader.pump()
 
     elif game_state == "PLAYING":
         # --- Game Logic ---
         for event in events:
-            if event.type == pygame.KEYDOWN:
-                # Return to menu after clear
-                if lv_cleared and event.key == pygame.K_RETURN:
-                    game_state = "LV_MENU"
-                # Manual reset
-                if event.key == pygame.K_r:
-                    death_count += 1
-                    reset_lv_data()
-                # Toggle debug
-                if event.key == pygame.K_m:
-                    DEBUG_MODE = not DEBUG_MODE
-                    print(f"Debug Mode: {'ON' if DEBUG_MODE else 'OFF'}")
-                # Pause
-                if event.key == pygame.K_ESCAPE and not lv_cleared:
-                    game_state = "PAUSED"
-
-        if not lv_cleared:
-            # 1. Timers & Radius Lerp
-            if shield_timer > 0: shield_timer -= 1
-            if torch_timer > 0:
-                torch_timer -= 1
-                target_radius = base_radius * 5
+            action = game.handle_event(event)
+            if action == "MENU":
+                game_state = "LV_MENU"
+            elif action == "PAUSE":
+                game_state = "PAUSED"
+            elif action == "RESET" and not replay:  # A replay's resets are in its inputs
+                reset_requested = True
+
+        # As many fixed steps as real time has covered (0 on a fast frame)
+        keys = read_keyboard()
+        inputs = 0
+        for _ in range(timestep.advance(frame_time)):
+            if replay:
+                inputs = next(replay_inputs, None)
+                if inputs is None:
+                    break
             else:
-                target_radius = base_radius
-            
-            current_radius += (target_radius - current_radius) * lerp_speed
-
-            # 2. Update Sprites
-            all_sprites.update(map_handler.walls, map_handler.hazards, map_handler.bouncers, shield_timer)
-            enemies.update(map_handler.walls)
-
-            # 3. Collisions
-            if player.is_dead:
-                death_count += 1
-                reset_lv_data()
-                continue
-
-            if pygame.sprite.spritecollideany(player, dest_group):
-                lv_cleared = True
-
-            # Prop collisions
-            p_hits = pygame.sprite.spritecollide(player, props_group, True)
-            for p in p_hits:
-                if p.prop_type == 1: player.vel.y = -12.0
-                elif p.prop_type == 2: has_anti_explosion = True
-                elif p.prop_type == 3: shield_timer = 5 * FPS
-                elif p.prop_type == 4: torch_timer = 2 * FPS
-
-            # Enemy collisions
-            e_hits = pygame.sprite.spritecollide(player, enemies, False)
-            if e_hits:
-                should_die = True
-                for e in e_hits:
-                    if shield_timer > 0 or has_anti_explosion:
-                        if hasattr(e, 'explode'): e.explode()
-                        else: e.kill()
-                        has_anti_explosion = False
-                        should_die = False
-                if should_die:
-                    death_count += 1
-                    reset_lv_data()
-                    continue
-
-        # ---  Draw ---
-        screen.fill((0, 0, 0))
-        screen.blit(map_handler.map_surface, (0, 0))
-        
-        #
-
-        # Visual feedback
-        if shield_timer > 0: player.image.set_alpha(150)
-        else: player.image.set_alpha(255)
-
-        all_sprites.draw(screen)
-
-        # Lighting
-        if not lv_cleared:
-            light_manager.draw(screen, player.rect, current_radius)
-
-        death_ui_font = pygame.font.SysFont("Consolas", 24, bold=True)
-        death_text = f"DEATHS: {death_count}"
-        death_surf = death_ui_font.render(death_text, True, (255, 60, 60))
-        death_rect = death_surf.get_rect(topright=(WIDTH - 25, 25))
-        
-        # 繪製半透明黑色背景框
-        bg_rect = death_rect.inflate(20, 10)
-        pygame.draw.rect(screen, (0, 0, 0, 160), bg_rect, border_radius=5)
-        pygame.draw.rect(screen, (255, 60, 60), bg_rect, 1, border_radius=5) # 紅色細邊框
-        screen.blit(death_surf, death_rect)
-
-        # Debug
-        if DEBUG_MODE:
-            Debugger.draw_hitboxes(screen, player, enemies, props_group, dest_group, map_handler)
-
-        # Clear UI
-        if lv_cleared:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
-            txt = font.render("MISSION ACCOMPLISHED", True, (0, 255, 0))
-            screen.blit(txt, txt.get_rect(center=(WIDTH//2, HEIGHT//2)))
-            sub = font.render("Press 'ENTER' to Menu", True, (200, 200, 200))
-            screen.blit(sub, sub.get_rect(center=(WIDTH//2, HEIGHT//2 + 80)))
+                inputs = keys | (RESET if reset_requested else 0)
+                reset_requested = False
+                if recorder:
+                    recorder.record(inputs)
+            game.step(inputs)
+        if replay and inputs is None:
+            print(f"Replay finished ({len(replay)} frames)")
+            replay = None
+            game_state = "LV_MENU"
+            continue
+
+        # Sprites drawn between the last two steps, by the time into the next one
+        dirty_rects = game.render(screen, alpha=timestep.alpha)
+
+        if game_state == "PAUSED":
+            # Freeze the world once; the pause screen reuses it every frame
+            game.render(screen, hud=False, alpha=timestep.alpha)
+            pause_menu.freeze(screen)
+            dirty_rects = pause_menu.draw()
 
     elif game_state == "PAUSED":
-        # Draw last frame
-        screen.fill((0, 0, 0))
-        screen.blit(map_handler.map_surface, (0, 0))
-        all_sprites.draw(screen)
-
-        light_manager.draw(screen, player.rect, current_radius)
-        # Draw pause menu
-        pause_menu.draw()
+        # Frozen frame + pause menu; only hover changes are redrawn
+        dirty_rects = pause_menu.draw()
 
         # Handle pause input
         for event in events:
@@ -251,6 +139,19 @@ while running:
             elif action == "MAIN_MENU":
                 game_state = "LV_MENU"
 
-    pygame.display.flip()
-
-pygame.quit()
\ No newline at end of file
+    # Recording ends when the run leaves the level
+    if recorder and game_state == "LV_MENU":
+        recorder.save(args.record)
+        recorder = None
+
+    # Dirty-rect renderer presents only what changed
+    with game.profiler.scope("present"):
+        if dirty_rects is not None:
+            pygame.display.update(dirty_rects)
+        else:
+            pygame.display.flip()
+    game.profiler.end_frame()
+
+if recorder:
+    recorder.save(args.record)
+pygame.quit()
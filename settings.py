@@ -4,7 +4,10 @@ import pygame as pg
 
 # Game Config
 TITLE = "Ink Ninja"
-FPS = 120
+FPS = 120         # Simulation steps per second; speeds, gravity and timers are per step
+RENDER_FPS = 120  # Display frame cap (0 = uncapped); gameplay speed does not depend on it
+MAX_CATCH_UP_STEPS = 8  # Steps a late frame may run before the game slows down instead
+PAUSED_FPS = 30  # Loop rate while paused (only menu hover is redrawn)
 GRID_WIDTH = 40
 GRID_HEIGHT = 30
 TILE_SIZE = 32
@@ -15,6 +18,10 @@ HEIGHT = GRID_HEIGHT * TILE_SIZE  # 30 x 32 = 960 px
 # File Paths
 TMX_FILE = 'assets/map/lv5.tmx'
 LEVEL_DATA_PATH = 'assets/map/lvsetting.json'
+LEVEL_CACHE_DIR = '.cache/levels'  # Compiled levels (rebuilt when the TMX or its tilesets change)
+LEVEL_CACHE_ENABLED = True
+PRELOAD_POOL_SIZE = 5   # Ready-to-play maps kept by the menu preloader (LRU)
+PRELOAD_BUDGET_MS = 4   # Main-thread time per menu frame spent finishing preloaded maps
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -31,8 +38,33 @@ JUMP_STRENGTH = -7.0
 BOOST_JUMP_STRENGTH = -12.0
 PLAYER_LIGHT_RADIUS = 128  # Player view radius (pixels)
 
+# Collision
+SPATIAL_CELL_SIZE = TILE_SIZE * 2  # Broadphase grid cell (pixels)
+ENEMY_BATCH_MIN = 16  # Enemy count from which EnemyManager steps them as NumPy arrays
+ENEMY_STEPS_PER_FRAME = 2  # Enemy updates per frame; the levels are tuned for two (enemy speeds, gravity)
+NAV_JUMP_SAMPLE = TILE_SIZE // 2  # Spacing of simulated jump take-off points (pixels)
+NAV_PATH_CACHE_SIZE = 256          # Enemy A* paths kept (LRU), keyed by (platform, target platform)
+
 # Effects
-SMOOTH_LIGHTING_ENABLED = True
+SMOOTH_LIGHTING_ENABLED = True  # Smooth (bilinear) light map upsampling; False = blocky but cheaper
+LIGHT_MAP_SCALE = 2           # Light map resolution divisor (2 = half, 4 = quarter)
+TORCH_PROP_LIGHT_RADIUS = 64  # Glow around torch props (pixels)
+LIGHT_RADIUS_STEP = 4         # Light radius quantization (pixels) for brush reuse
+LIGHT_BRUSH_CACHE_SIZE = 64   # Max scaled brushes kept (LRU)
+SHADOWS_ENABLED = True        # Walls block light (line-of-sight visibility polygons)
+SHADOW_WALL_DEPTH = 12        # How far light reaches into the wall it hits (pixels), so lit faces show
+SHADOW_CACHE_SIZE = 16        # Shadow-masked brushes kept (LRU), keyed by light position and radius
+MENU_PARTICLES = 18           # Rising triangles behind the level menu (the engine handles thousands)
+MENU_PARTICLE_FRAMES = 24     # Pre-rotated frames per triangle size (5 degree steps)
+EFFECT_PARTICLES = 512        # In-game effect particle pool (explosions, pickups)
+
+# Rendering
+CHUNK_TILES = 16                         # Map chunk edge (tiles); chunks are baked on demand
+CHUNK_CACHE_BUDGET = 64 * 1024 * 1024    # Max bytes of baked map chunks kept (LRU)
+TEXT_CACHE_SIZE = 256   # Rendered text surfaces kept (LRU), keyed by font/text/colour/antialias
+DIRTY_RECT_RENDERING = True  # Redraw/present only changed areas while PLAYING; False = full redraw + flip
 
 # Debug
-DEBUG_MODE = False
\ No newline at end of file
+DEBUG_MODE = False
+PROFILE_FRAMES = 240       # Frames kept by the debug profiler (ring buffer)
+PROFILE_DIR = 'profiles'   # F2 in debug mode dumps the buffer here (CSV + JSON)
\ No newline at end of file
@@ -9,6 +9,3 @@ class Destination(pygame.sprite.Sprite):
         self.image.fill((255, 120, 120, 0))
 
         self.rect = self.image.get_rect(topleft=(x, y))
-
-    def update(self, *args, **kwargs):
-        pass
\ No newline at end of file
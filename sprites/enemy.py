@@ -1,11 +1,20 @@
+import numpy as np
 import pygame
-from settings import TILE_SIZE, resource_path
+from settings import TILE_SIZE, ENEMY_BATCH_MIN
+from core.assets import load_frames, load_frame_bank
 
 GRAVITY = 0.7
+MAX_FALL_SPEED = 10
+JUMP_STRENGTH = -9.0  # Chasing enemies only; patrols never leave the ground
+FLASH_FRAMES = 12  # Hit-flash duration after explode()
+
+# Behaviours (lvsetting.json "behavior")
+PATROL = "patrol"  # Back and forth around start_x (default)
+CHASE = "chase"    # Follow the player across platforms (needs chase())
 
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, move_range, speed):
+    def __init__(self, x, y, move_range, speed, behavior=PATROL):
         super().__init__()
 
         # --- Animation Settings ---
@@ -19,6 +28,9 @@ class Enemy(pygame.sprite.Sprite):
             "idle": self._load_frames("assets/sprites/enemy_idle.png", 4),
             "run": self._load_frames("assets/sprites/enemy_run.png", 6)
         }
+        # Mirrored and hit-flash copies are baked once, never per frame
+        self.frames = load_frame_bank(self.animations, ("normal", "flash"))
+        self.flash_timer = 0
 
         # Set initial image
         self.image = self.animations[self.state][self.frame_index]
@@ -32,26 +44,40 @@ class Enemy(pygame.sprite.Sprite):
         self.speed = speed
         self.direction = 1
         self.is_dead = False
+        self.manager = None  # Set by EnemyManager.add(); the manager then steps this enemy
+        self.index = -1
+
+        # Chasing (see chase())
+        self.behavior = behavior
+        self.nav = None
+        self.target = None       # Rect being chased (the player's)
+        self.target_node = None  # Last platform the target stood on
+        self.plan = None         # (own node, target node) the path was planned for
+        self.path = None
+
+    def snapshot(self):
+        """Mutable state as a tuple, for restore(). The chase target and graph are kept as they are."""
+        return (self.pos.x, self.pos.y, self.vel.x, self.vel.y, self.rect.x, self.rect.y,
+                self.direction, self.frame_index, self.state, self.facing_right, self.flash_timer,
+                self.image, self.is_dead, self.target_node, self.plan, self.path)
+
+    def restore(self, state):
+        """Put back a snapshot() in place (EnemyManager arrays: see EnemyManager.restore)."""
+        (self.pos.x, self.pos.y, self.vel.x, self.vel.y, self.rect.x, self.rect.y,
+         self.direction, self.frame_index, self.state, self.facing_right, self.flash_timer,
+         self.image, self.is_dead, self.target_node, self.plan, self.path) = state
 
     def _load_frames(self, path, frame_count):
-        """Helper to slice spritesheet."""
-        frames = []
+        """Helper to slice spritesheet (shared through the asset cache)."""
         try:
-            sheet = pygame.image.load(resource_path(path)).convert_alpha()
-            for i in range(frame_count):
-                # Each action is 32x32, sliced horizontally
-                frame = sheet.subsurface((i * 32, 0, 32, 32))
-                # Scale if TILE_SIZE is not 32
-                if TILE_SIZE != 32:
-                    frame = pygame.transform.scale(frame, (TILE_SIZE, TILE_SIZE))
-                frames.append(frame)
+            # Each action is 32x32, sliced horizontally; scale if TILE_SIZE is not 32
+            return load_frames(path, frame_count, (32, 32), size=(TILE_SIZE, TILE_SIZE))
         except Exception as e:
             print(f"Animation load error {path}: {e}")
             # Fallback: Red square
             dummy = pygame.Surface((TILE_SIZE, TILE_SIZE))
             dummy.fill((255, 0, 0))
-            frames = [dummy]
-        return frames
+            return [dummy]
 
     def _animate(self):
         """Handle frame switching and flipping."""
@@ -62,26 +88,30 @@ class Enemy(pygame.sprite.Sprite):
         if self.frame_index >= len(animation):
             self.frame_index = 0
 
-        # Get current frame
-        current_frame = animation[int(self.frame_index)]
-
-        # 🚨 Handle flipping
-        # Flip if direction is -1 and currently facing right
-        if self.direction < 0:
-            self.image = pygame.transform.flip(current_frame, True, False)
-        else:
-            self.image = current_frame
+        # Facing left (direction -1) uses the pre-mirrored frames
+        variant = "flash" if self.flash_timer > 0 else "normal"
+        self.image = self.frames[(self.state, self.direction >= 0, variant)][int(self.frame_index)]
 
     def update(self, walls, *args, **kwargs):
         """
         Accepts *args to prevent errors,
         Fixes previous TypeError: Enemy.update() takes 2 positional arguments but 4 were given
         """
-        if self.is_dead:
+        if self.is_dead or self.manager is not None:
             return
+        self._step(walls)
 
+    def chase(self, nav, target):
+        """Follow `target` (a rect) using `nav`, a core.navigation.NavGraph for this speed."""
+        self.nav = nav
+        self.target = target
+
+    def _step(self, walls):
         self._apply_gravity()
-        self._patrol_move()
+        if self.nav is not None:
+            self._chase_move()
+        else:
+            self._patrol_move()
 
         # Determine state based on speed
         self.state = "run" if self.vel.x != 0 else "idle"
@@ -96,12 +126,14 @@ class Enemy(pygame.sprite.Sprite):
         self.pos.y = self.rect.y
 
         # Update animation
+        if self.flash_timer > 0:
+            self.flash_timer -= 1
         self._animate()
 
     # --- _apply_gravity, _patrol_move, _collide_and_resolve logic remains same ---
     def _apply_gravity(self):
         self.vel.y += GRAVITY
-        if self.vel.y > 10: self.vel.y = 10
+        if self.vel.y > MAX_FALL_SPEED: self.vel.y = MAX_FALL_SPEED
 
     def _patrol_move(self):
         self.vel.x = self.direction * self.speed
@@ -111,8 +143,48 @@ class Enemy(pygame.sprite.Sprite):
         elif current_center_x >= self.start_x + self.move_range / 2:
             self.direction = -1
 
+    def _chase_move(self):
+        """Head along the planned path; re-plan only when either end changes platform."""
+        nav = self.nav
+        node = nav.node_at(self.rect)
+        target_node = nav.node_at(self.target)
+        if target_node is not None:
+            self.target_node = target_node
+        if node is None or self.target_node is None:
+            # In the air (or nothing to chase yet): keep going the same way
+            self.vel.x = self.direction * self.speed if node is None else 0
+            return
+        if (node, self.target_node) != self.plan:
+            self.plan = (node, self.target_node)
+            self.path = nav.path(node, self.target_node)
+        if self.path is None:
+            self._patrol_move()  # Unreachable: fall back to the patrol
+            return
+
+        if self.path:
+            link = self.path[0]
+            goal_x = link.x
+        else:
+            link = None
+            goal_x = self.target.centerx - self.rect.width // 2
+        dx = goal_x - self.rect.x
+        if link is not None and abs(dx) < nav.step_toward(dx):
+            # At the take-off point
+            self.rect.x = self.pos.x = goal_x
+            self.direction = link.direction
+            if link.kind == "jump":
+                self.vel.y = JUMP_STRENGTH
+        elif abs(dx) < nav.step_toward(dx):
+            self.vel.x = 0  # Caught up
+            return
+        elif link is None or link.kind == "jump":
+            self.direction = 1 if dx > 0 else -1
+        else:
+            self.direction = link.direction  # Walk/drop: just head off that edge
+        self.vel.x = self.direction * self.speed
+
     def _collide_and_resolve_x(self, walls):
-        for wall in walls:
+        for wall in walls.query(self.rect):
             if self.rect.colliderect(wall):
                 self.direction *= -1
                 if self.direction > 0:
@@ -122,7 +194,7 @@ class Enemy(pygame.sprite.Sprite):
                 break
 
     def _collide_and_resolve_y(self, walls):
-        for wall in walls:
+        for wall in walls.query(self.rect):
             if self.rect.colliderect(wall):
                 if self.vel.y > 0:
                     self.rect.bottom = wall.top
@@ -132,6 +204,179 @@ class Enemy(pygame.sprite.Sprite):
                 break
 
     def explode(self):
-        pass
+        self.flash_timer = FLASH_FRAMES
+        if self.manager is not None:
+            self.manager.set_flash(self.index, FLASH_FRAMES)
         # self.is_dead = True
-        # self.kill()
\ No newline at end of file
+        # self.kill()
+
+
+class EnemyManager:
+    """Steps every Enemy of a level at once from struct-of-arrays state.
+
+    Position, velocity, patrol and animation state live in NumPy arrays, one
+    slot per enemy, and gravity, patrol reversal and wall resolution run as
+    array operations. The arithmetic mirrors Enemy.update step for step
+    (float64, int truncation, first colliding wall in list order), so the
+    result is identical to updating each sprite on its own. Sprites stay the
+    public face: their rect, image and state fields are written back after
+    every update, which also lets the arrays be rebuilt from them at any time.
+
+    Below `batch_min` enemies the fixed NumPy overhead outweighs the
+    win, so small groups are stepped sprite by sprite instead.
+    """
+
+    # Arrays update() changes; the rest are fixed per enemy
+    STATE = ("x", "y", "rect_y", "vx", "vy", "direction", "flash", "frame_index", "dead")
+
+    def __init__(self, enemies=(), batch_min=ENEMY_BATCH_MIN):
+        self.batch_min = batch_min
+        self.sprites = []
+        self._stale = True
+        self._walls_src = None
+        for enemy in enemies:
+            self.add(enemy)
+
+    def add(self, enemy):
+        enemy.manager = self
+        enemy.index = len(self.sprites)
+        self.sprites.append(enemy)
+        self._stale = True
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def snapshot(self):
+        """Copies of the per-frame state arrays, or None while enemies are stepped one by one."""
+        if len(self.sprites) < self.batch_min:
+            return None
+        if self._stale:
+            self._build()
+        return {name: getattr(self, name).copy() for name in self.STATE}
+
+    def restore(self, state):
+        """Copy a snapshot() back into the state arrays, in place.
+
+        Arrays not built yet are left alone: they are built from the
+        (restored) sprites on the next update.
+        """
+        if state is None or self._stale:
+            return
+        for name, saved in state.items():
+            np.copyto(getattr(self, name), saved)
+
+    def set_flash(self, index, frames):
+        if not self._stale:
+            self.flash[index] = frames
+
+    def _build(self):
+        sprites = self.sprites
+        def column(field, dtype=np.float64):
+            return np.array([field(e) for e in sprites], dtype=dtype)
+        self.x = column(lambda e: e.pos.x)
+        self.y = column(lambda e: e.pos.y)
+        self.rect_y = column(lambda e: e.rect.y, np.int64)
+        self.vx = column(lambda e: e.vel.x)
+        self.vy = column(lambda e: e.vel.y)
+        self.w = column(lambda e: e.rect.width, np.int64)
+        self.h = column(lambda e: e.rect.height, np.int64)
+        self.start_x = column(lambda e: e.start_x)
+        self.move_range = column(lambda e: e.move_range)
+        self.speed = column(lambda e: e.speed)
+        self.direction = column(lambda e: e.direction, np.int64)
+        self.flash = column(lambda e: e.flash_timer, np.int64)
+        self.frame_index = column(lambda e: e.frame_index)
+        self.anim_speed = column(lambda e: e.animation_speed)
+        self.run_len = column(lambda e: len(e.animations["run"]), np.int64)
+        self.idle_len = column(lambda e: len(e.animations["idle"]), np.int64)
+        self.dead = column(lambda e: e.is_dead, bool)
+        self._stale = False
+
+    def _wall_arrays(self, walls):
+        """Wall edges as arrays, rebuilt only when the wall set changes."""
+        if walls is not self._walls_src:
+            rects = [r for r in walls if r.width > 0 and r.height > 0]  # Empty rects never collide
+            self._walls = tuple(np.array([getattr(r, edge) for r in rects], dtype=np.int64)
+                                for edge in ("left", "top", "right", "bottom"))
+            self._walls_src = walls
+        return self._walls
+
+    def _first_hit(self, x, y, walls):
+        """Index of the first wall each rect overlaps (colliderect), -1 if none."""
+        left, top, right, bottom = walls
+        hit = ((x[:, None] < right) & (left < (x + self.w)[:, None]) &
+               (y[:, None] < bottom) & (top < (y + self.h)[:, None]))
+        return np.where(hit.any(axis=1), hit.argmax(axis=1), -1)
+
+    def update(self, walls):
+        """One Enemy.update for every live enemy. `walls`: iterable of wall rects."""
+        if len(self.sprites) < self.batch_min:
+            for enemy in self.sprites:
+                if not enemy.is_dead:
+                    enemy._step(walls)
+            return
+        if self._stale:
+            self._build()
+        live = ~self.dead
+        wall_arrays = self._wall_arrays(walls)
+        left, top, right, bottom = wall_arrays
+        has_walls = len(left) > 0
+
+        # Gravity
+        vy = np.where(live, np.minimum(self.vy + GRAVITY, MAX_FALL_SPEED), self.vy)
+
+        # Patrol: velocity from the current direction, then turn at the range ends
+        vx = np.where(live, self.direction * self.speed, self.vx)
+        center = self.x + self.w / 2
+        direction = np.where(center <= self.start_x - self.move_range / 2, 1,
+                             np.where(center >= self.start_x + self.move_range / 2, -1, self.direction))
+        direction = np.where(live, direction, self.direction)
+
+        # X movement: the first wall hit flips direction and snaps to its side
+        rx = np.trunc(self.x + vx).astype(np.int64)
+        ry = self.rect_y
+        if has_walls:
+            hit = np.where(live, self._first_hit(rx, ry, wall_arrays), -1)
+            bumped = hit >= 0
+            direction = np.where(bumped, -direction, direction)
+            rx = np.where(bumped & (direction > 0), left[hit] - self.w, rx)
+            rx = np.where(bumped & (direction <= 0), right[hit], rx)
+
+        # Y movement: the first wall hit lands on / bonks under it
+        ry = np.where(live, np.trunc(self.y + vy).astype(np.int64), ry)
+        if has_walls:
+            hit = np.where(live, self._first_hit(rx, ry, wall_arrays), -1)
+            bumped = hit >= 0
+            ry = np.where(bumped & (vy > 0), top[hit] - self.h, ry)
+            ry = np.where(bumped & (vy <= 0), bottom[hit], ry)
+            vy = np.where(bumped, 0.0, vy)
+
+        self.x = np.where(live, rx, self.x)
+        self.y = np.where(live, ry, self.y)
+        self.rect_y = np.where(live, ry, self.rect_y)
+        self.vx, self.vy, self.direction = vx, vy, direction
+
+        # Animation
+        self.flash = np.where(live & (self.flash > 0), self.flash - 1, self.flash)
+        frame_index = self.frame_index + self.anim_speed
+        frame_index = np.where(frame_index >= np.where(vx != 0, self.run_len, self.idle_len), 0, frame_index)
+        self.frame_index = np.where(live, frame_index, self.frame_index)
+
+        self._sync(live)
+
+    def _sync(self, live):
+        """Write array state back to the sprites."""
+        for enemy, alive, x, y, vx, vy, direction, flash, frame in zip(
+                self.sprites, live.tolist(), self.x.tolist(), self.y.tolist(), self.vx.tolist(),
+                self.vy.tolist(), self.direction.tolist(), self.flash.tolist(), self.frame_index.tolist()):
+            if not alive:
+                continue
+            enemy.pos.x = enemy.rect.x = int(x)
+            enemy.pos.y = enemy.rect.y = int(y)
+            enemy.vel.x, enemy.vel.y = vx, vy
+            enemy.direction = direction
+            enemy.flash_timer = flash
+            enemy.frame_index = frame
+            enemy.state = "run" if vx != 0 else "idle"
+            variant = "flash" if flash > 0 else "normal"
+            enemy.image = enemy.frames[(enemy.state, direction >= 0, variant)][int(frame)]
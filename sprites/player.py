@@ -1,5 +1,7 @@
 import pygame
-from settings import TILE_SIZE, GRAVITY, PLAYER_SPEED, JUMP_STRENGTH, BOOST_JUMP_STRENGTH, resource_path
+from settings import TILE_SIZE, GRAVITY, PLAYER_SPEED, JUMP_STRENGTH, BOOST_JUMP_STRENGTH
+from core.inputs import LEFT, RIGHT, JUMP
+from core.assets import load_frames, load_frame_bank
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y):
@@ -9,10 +11,13 @@ class Player(pygame.sprite.Sprite):
         self.facing_right = True
         self.is_dead = False
         self.on_ground = False
-        
+        self.effect = "normal"  # Frame bank variant: normal / shield
+
         # Load slices (Width 96px, Height 128px)
         self.run_frames = self._load_run_frames("assets/sprites/only_run.png", 6)
-        
+        # Mirrored and shield-tinted copies are baked once, never per frame
+        self.frames = load_frame_bank({"run": self.run_frames}, ("normal", "shield"))
+
         self.image = self.run_frames[0]
         self.rect = self.image.get_rect(topleft=(x, y))
         
@@ -20,22 +25,26 @@ class Player(pygame.sprite.Sprite):
         self.pos = pygame.math.Vector2(x, y)
         self.vel = pygame.math.Vector2(0, 0)
 
+    def snapshot(self):
+        """Mutable state as a tuple, for restore() (frames and size never change)."""
+        return (self.pos.x, self.pos.y, self.vel.x, self.vel.y, self.rect.x, self.rect.y,
+                self.frame_index, self.facing_right, self.is_dead, self.on_ground, self.effect, self.image)
+
+    def restore(self, state):
+        """Put back a snapshot() in place."""
+        (self.pos.x, self.pos.y, self.vel.x, self.vel.y, self.rect.x, self.rect.y,
+         self.frame_index, self.facing_right, self.is_dead, self.on_ground, self.effect, self.image) = state
+
     def _load_run_frames(self, path, count):
-        frames = []
         try:
-            sheet = pygame.image.load(resource_path(path)).convert_alpha()
-            f_w, f_h, spacing = 96, 128, 32
-            for i in range(count):
-                x_pos = i * (f_w + spacing)
-                frame = sheet.subsurface((x_pos, 0, f_w, f_h))
-                # Scale to fit game (Width ~0.8 tiles, Height ~1.2 tiles)
-                frame = pygame.transform.scale(frame, (int(TILE_SIZE * 0.8), int(TILE_SIZE * 1.2)))
-                frames.append(frame)
+            # Sheet frames are 96x128 with 32px gaps.
+            # Scale to fit game (Width ~0.8 tiles, Height ~1.2 tiles)
+            return load_frames(path, count, (96, 128), spacing=32,
+                               size=(int(TILE_SIZE * 0.8), int(TILE_SIZE * 1.2)))
         except:
             surf = pygame.Surface((32, 48))
             surf.fill((0, 0, 255))
-            frames = [surf]
-        return frames
+            return [surf]
 
     def _animate(self):
         # Ensure self.image has a value even if not moving
@@ -49,11 +58,17 @@ class Player(pygame.sprite.Sprite):
             self.frame_index = 0
         
         # Update image
-        img = self.run_frames[int(self.frame_index)]
-        self.image = pygame.transform.flip(img, True, False) if not self.facing_right else img
+        self.image = self.frames[("run", self.facing_right, self.effect)][int(self.frame_index)]
+
+    def update(self, walls, hazards, bouncers, has_shield, inputs=0, *args, **kwargs):
+        """Whole frame in one call; the game's scheduler runs the phases below separately."""
+        self._get_input(inputs)
+        self.move(walls)
+        self.animate(has_shield)
+        self.check_world(hazards, bouncers, has_shield)
 
-    def update(self, walls, hazards, bouncers,has_shield, *args, **kwargs):
-        self._get_input()
+    def move(self, walls):
+        """Physics: gravity, then X and Y movement each resolved against walls."""
         self._apply_gravity()
 
         # Separate X and Y movement and collision to prevent diagonal wall clipping
@@ -68,23 +83,27 @@ class Player(pygame.sprite.Sprite):
         self.rect.y = round(self.pos.y)
         self._collide_with_walls(walls, 'y')
 
+    def animate(self, has_shield):
+        self.effect = "shield" if has_shield else "normal"
         self._animate()
 
+    def check_world(self, hazards, bouncers, has_shield):
+        """Collision with world volumes: lethal hazards and bouncers."""
         if self._check_lethal(hazards) and not has_shield:
             self.is_dead = True
         self._check_bouncers(bouncers)
 
-    def _get_input(self):
-        keys = pygame.key.get_pressed()
+    def _get_input(self, inputs):
+        # inputs: bitmask from core.inputs (keyboard, replay or bot)
         self.vel.x = 0
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        if inputs & LEFT:
             self.vel.x = -PLAYER_SPEED
             self.facing_right = False
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        if inputs & RIGHT:
             self.vel.x = PLAYER_SPEED
             self.facing_right = True
-            
-        if (keys[pygame.K_SPACE] or keys[pygame.K_w] or keys[pygame.K_UP]) and self.on_ground:
+
+        if inputs & JUMP and self.on_ground:
             self.vel.y = JUMP_STRENGTH
             self.on_ground = False
 
@@ -93,7 +112,9 @@ class Player(pygame.sprite.Sprite):
         if self.vel.y > 10: self.vel.y = 10
 
     def _collide_with_walls(self, walls, direction):
-        for wall in walls:
+        # Query area covers both the previous and the current position
+        area = self.rect.inflate(int(abs(self.vel.x)) * 2 + 2, int(abs(self.vel.y)) * 2 + 2)
+        for wall in walls.query(area):
             if self.rect.colliderect(wall):
                 if direction == 'x':
                     if self.vel.x > 0: self.rect.right = wall.left
@@ -110,11 +131,11 @@ class Player(pygame.sprite.Sprite):
                     self.vel.y = 0
 
     def _check_lethal(self, hazards):
-        return any(self.rect.colliderect(h) for h in hazards)
+        return any(self.rect.colliderect(h) for h in hazards.query(self.rect))
 
     def _check_bouncers(self, bouncers):
         if self.vel.y > 0:
-            for b in bouncers:
+            for b in bouncers.query(self.rect):
                 if self.rect.colliderect(b) and (self.rect.bottom - self.vel.y) <= b.top:
                     self.vel.y = BOOST_JUMP_STRENGTH
                     self.rect.bottom = b.top
@@ -1,5 +1,6 @@
 import pygame
-from settings import TILE_SIZE, resource_path
+from settings import TILE_SIZE, TORCH_PROP_LIGHT_RADIUS
+from core.assets import load_image
 
 
 class Prop(pygame.sprite.Sprite):
@@ -11,10 +12,8 @@ class Prop(pygame.sprite.Sprite):
         # Load static image (e.g., assets/sprites/prop_1.png)
         try:
             path = f"assets/sprites/prop_{self.prop_type}.png"
-            self.image = pygame.image.load(resource_path(path)).convert_alpha()
             # Ensure size fits game settings
-            if self.image.get_size() != (32, 32):
-                self.image = pygame.transform.scale(self.image, (32, 32))
+            self.image = load_image(path, size=(32, 32))
         except:
             # Fallback: Draw colored square if image missing
             self.image = pygame.Surface((32, 32))
@@ -22,7 +21,5 @@ class Prop(pygame.sprite.Sprite):
             self.image.fill(colors.get(self.prop_type, (200, 200, 200)))
 
         self.rect = self.image.get_rect(topleft=(x, y))
-
-    def update(self, *args, **kwargs):
-        # Static props don't need update logic
-        pass
\ No newline at end of file
+        # Torch props glow in the dark
+        self.light_radius = TORCH_PROP_LIGHT_RADIUS if self.prop_type == 4 else 0
@@ -0,0 +1,7 @@
+"""Run the tests against the repository root, as the game and the tools do."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,45 @@
+"""merge_rects: merged collision rects cover exactly the authored pixels, without overlapping."""
+import random
+
+import pygame
+import pytest
+import pytmx
+from core.geometry import merge_rects, same_coverage
+from core.maploader import _load_objects_from_layer
+
+LEVELS = [1, 2, 3, 4, 5]
+LAYERS = ("Collision", "Hazards", "Bouncers")
+FUZZ_CASES = 500
+
+
+def check(rects):
+    merged = merge_rects(rects)
+    assert same_coverage(rects, merged)
+    assert len(merged) <= len(rects)
+    if len(merged) < sum(r[2] > 0 and r[3] > 0 for r in rects):  # Unchanged input may overlap; a merge never does
+        assert not any(a.colliderect(b) for i, a in enumerate(merged) for b in merged[i + 1:])
+
+
+@pytest.mark.parametrize("layer_name", LAYERS)
+@pytest.mark.parametrize("lv", LEVELS)
+def test_shipped_levels(lv, layer_name):
+    tmx_data = pytmx.TiledMap(f"assets/map/lv{lv}.tmx")
+    check(_load_objects_from_layer(tmx_data, layer_name))
+
+
+@pytest.mark.parametrize("seed", range(FUZZ_CASES))
+def test_fuzz(seed):
+    rng = random.Random(seed)
+    rects = [pygame.Rect(rng.randrange(0, 256, rng.choice((1, 8, 32))), rng.randrange(0, 256, 8),
+                         rng.randrange(0, 96), rng.randrange(0, 96))
+             for _ in range(rng.randrange(1, 40))]
+    check(rects)
+
+
+def test_empty_and_degenerate():
+    assert merge_rects([]) == []
+    assert merge_rects([pygame.Rect(0, 0, 0, 10), pygame.Rect(5, 5, 4, 4)]) == [pygame.Rect(5, 5, 4, 4)]
+
+
+def test_touching_rects_merge():
+    assert merge_rects([pygame.Rect(0, 0, 32, 32), pygame.Rect(32, 0, 32, 32)]) == [pygame.Rect(0, 0, 64, 32)]
@@ -0,0 +1,107 @@
+"""Frame-time benchmark: replays input recordings and reports percentiles.
+
+Usage: python tools/bench.py [recordings...] [--synthetic FRAMES] [--no-draw]
+
+With no arguments, replays recordings/lv1.rec .. recordings/lv5.rec. Levels
+without a recording get a seeded random input stream of --synthetic frames
+(default 3000) instead; --synthetic 0 skips them. Exits non-zero if a level
+fails to load.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from settings import WIDTH, HEIGHT
+from core.game import Game, init_headless
+from core.replay import Replay
+from core.scheduler import PHASES
+from common import random_inputs
+
+LEVELS = [f"lv{n}" for n in range(1, 6)]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def synthetic_replay(level_id, frames, seed=0):
+    rng = random.Random(f"{level_id}:{seed}")
+    return Replay(level_id, bytearray(random_inputs(frames, rng)))
+
+
+def run(replay, screen):
+    game = Game()
+    if not game.load_level(replay.level_num):
+        return None
+    samples = {phase: [] for phase in PHASES + ("draw", "total")}
+    for inputs in replay:
+        game.step(inputs)
+        draw = 0.0
+        if screen is not None:
+            t0 = time.perf_counter()
+            game.render(screen)
+            draw = time.perf_counter() - t0
+        for phase in PHASES:
+            samples[phase].append(game.timings[phase])
+        samples["draw"].append(draw)
+        samples["total"].append(sum(game.timings.values()) + draw)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recordings", nargs="*")
+    parser.add_argument("--synthetic", type=int, metavar="FRAMES", default=3000,
+                        help="random input frames for levels without a recording (0: skip them)")
+    parser.add_argument("--no-draw", action="store_true", help="skip render() (simulation only)")
+    args = parser.parse_args()
+
+    init_headless()
+    screen = None if args.no_draw else pygame.display.set_mode((WIDTH, HEIGHT))
+
+    replays = [Replay.load(path) for path in args.recordings]
+    if not replays:
+        for level_id in LEVELS:
+            path = os.path.join("recordings", f"{level_id}.rec")
+            if os.path.exists(path):
+                replays.append(Replay.load(path))
+            elif args.synthetic:
+                print(f"{level_id}: no recording at {path}, using {args.synthetic} synthetic frames")
+                replays.append(synthetic_replay(level_id, args.synthetic))
+            else:
+                print(f"{level_id}: no recording at {path}, skipped")
+
+    rows = []
+    failed = False
+    for replay in replays:
+        samples = run(replay, screen)
+        if samples is None:
+            print(f"{replay.level_id}: level failed to load")
+            failed = True
+        else:
+            rows.append((replay, samples))
+
+    print()
+    print(f"{'level':<6} {'frames':>7} {'phase':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for replay, samples in rows:
+        for phase in PHASES + ("draw", "total"):
+            values = sorted(samples[phase])
+            p50, p95, p99 = (percentile(values, p) * 1000 for p in (50, 95, 99))
+            print(f"{replay.level_id:<6} {len(replay):>7} {phase:<10} {p50:>8.3f} {p95:>8.3f} {p99:>8.3f}")
+
+    if failed or not rows:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Enemy update benchmark: per-sprite Enemy.update vs the array-based EnemyManager.
+
+First checks that both produce identical state on the shipped levels (enemies
+from lvsetting.json, random hit flashes), then times both at 10, 100 and 1000
+enemies spread over the lv5 floors.
+Usage: python tools/bench_enemies.py [--frames N] [--counts 10 100 1000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from core.game import init_headless
+from core.maploader import TiledMap
+from core import level_data
+from sprites.enemy import Enemy, EnemyManager
+from common import stress_entries
+
+
+def spawn(entries):
+    return [Enemy(e.start_pos[0], e.start_pos[1], e.move_range, e.speed) for e in entries]
+
+
+def state(enemy):
+    return (enemy.pos.x, enemy.pos.y, tuple(enemy.rect), enemy.vel.x, enemy.vel.y, enemy.direction,
+            enemy.flash_timer, enemy.frame_index, enemy.state, enemy.image)
+
+
+def check(tiled_map, entries, frames, rng):
+    """Step reference sprites and a managed copy side by side. Returns the first bad frame or None."""
+    reference, managed = spawn(entries), spawn(entries)
+    manager = EnemyManager(managed, batch_min=0)  # Always the array path
+    walls = tiled_map.wall_index
+    for frame in range(frames):
+        if rng.random() < 0.02:
+            i = rng.randrange(len(entries))
+            reference[i].explode()
+            managed[i].explode()
+        for e in reference:
+            e.update(walls)
+        manager.update(walls)
+        if [state(e) for e in reference] != [state(e) for e in managed]:
+            return frame
+    return None
+
+
+def timed(step, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        step()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--counts", type=int, nargs="*", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    init_headless()
+    rng = random.Random(0)
+    maps = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for lv in range(1, 6):
+            maps[lv] = TiledMap(f"assets/map/lv{lv}.tmx")
+
+    failed = False
+    for lv, tiled_map in maps.items():
+        entries = level_data.get(f"lv{lv}").enemies
+        if not entries:
+            print(f"lv{lv}: no enemies")
+            continue
+        bad = check(tiled_map, entries, args.frames, rng)
+        failed |= bad is not None
+        print(f"lv{lv}: {len(entries)} enemies, {args.frames} frames "
+              + ("identical" if bad is None else f"MISMATCH at frame {bad}"))
+    bad = check(maps[5], stress_entries(maps[5], 200, rng), args.frames, rng)
+    failed |= bad is not None
+    print(f"lv5 stress: 200 enemies, {args.frames} frames " + ("identical" if bad is None else f"MISMATCH at frame {bad}"))
+
+    print()
+    print(f"{'enemies':>8} {'sprites ms':>11} {'manager ms':>11} {'speedup':>8}")
+    walls = maps[5].wall_index
+    for count in args.counts:
+        entries = stress_entries(maps[5], count, rng)
+        reference = spawn(entries)
+        manager = EnemyManager(spawn(entries), batch_min=0)
+        per_sprite = timed(lambda: [e.update(walls) for e in reference], 200)
+        batched = timed(lambda: manager.update(walls), 200)
+        print(f"{count:>8} {per_sprite:>11.3f} {batched:>11.3f} {per_sprite / batched:>7.1f}x")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
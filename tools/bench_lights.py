@@ -0,0 +1,106 @@
+"""Lighting benchmark: line-of-sight shadows vs plain radial lights.
+
+Plays a seeded random input stream on a level (lv5 by default) with full
+rendering and reports the "lights" profiler scope (carving, shadow masks,
+upsampling and the light map blit) per frame, for:
+  plain      shadows off (radial brushes only)
+  shadows    visibility polygons + masked brush cache
+  uncached   visibility polygons rebuilt for every light, every frame
+  torch      shadows with the torch radius (5x) active the whole run
+  moving     torch, with the player running back and forth and jumping
+             non-stop, so the shadow polygons are invalidated every frame
+The "moving" column is the share of frames on which the player's light moved.
+The first WARMUP frames (cold brush caches, torch radius growing) are left
+out of the percentiles. Random play mostly stands still, so its tail depends
+on the run length; only "moving" is gated: exits non-zero if its p99 exceeds
+the frame budget.
+Usage: python tools/bench_lights.py [--level 5] [--frames 1200]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+import numpy as np
+import core.game
+import core.light_manager
+from settings import WIDTH, HEIGHT, FPS, RENDER_FPS, LIGHT_MAP_SCALE
+from core.game import Game, init_headless
+from core.inputs import LEFT, RIGHT, JUMP
+from common import random_inputs
+
+MODES = ("plain", "shadows", "uncached", "torch", "moving")
+WARMUP = 120  # Frames
+
+
+def moving_inputs(frames):
+    """Run right then left in 90-frame legs, jumping every 30 frames."""
+    for frame in range(frames):
+        mask = RIGHT if frame // 90 % 2 == 0 else LEFT
+        yield mask | (JUMP if frame % 30 < 2 else 0)
+
+
+def run(level, frames, mode, screen):
+    core.game.SHADOWS_ENABLED = mode != "plain"
+    cache_size = core.light_manager.SHADOW_CACHE_SIZE
+    if mode == "uncached":
+        core.light_manager.SHADOW_CACHE_SIZE = 0
+    try:
+        game = Game()
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.load_level(level)
+            game.profiler.enabled = True
+            moved = 0
+            for mask in moving_inputs(frames) if mode == "moving" else random_inputs(frames, random.Random(0)):
+                if mode in ("torch", "moving"):
+                    game.torch_timer = FPS
+                # The player's light changes its shadow cache key (one low-res pixel)
+                key = [c // LIGHT_MAP_SCALE for c in game.player.rect.center]
+                game.step(mask)
+                game.render(screen)
+                game.profiler.end_frame()
+                moved += [c // LIGHT_MAP_SCALE for c in game.player.rect.center] != key
+    finally:
+        core.light_manager.SHADOW_CACHE_SIZE = cache_size
+    lights = game.profiler.history()[:, game.profiler.scopes.index("lights")] * 1000
+    return lights[WARMUP:], moved / frames, game.light_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--level", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=1200)
+    args = parser.parse_args()
+    if args.frames <= WARMUP:
+        parser.error(f"--frames must be over the {WARMUP}-frame warm-up")
+
+    init_headless()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    budget = 1000 / (RENDER_FPS or FPS)
+
+    print(f"lv{args.level}, {args.frames} frames ({WARMUP} warm-up), frame budget {budget:.2f} ms")
+    print(f"{'mode':<9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cache hits':>11} {'moving':>7}")
+    failed = False
+    for mode in MODES:
+        lights, moved, manager = run(args.level, args.frames, mode, screen)
+        p50, p95, p99 = np.percentile(lights, (50, 95, 99))
+        looked_up = manager.shadow_hits + manager.shadow_misses
+        hits = f"{100 * manager.shadow_hits / looked_up:.0f}%" if looked_up else "-"
+        print(f"{mode:<9} {p50:>8.3f} {p95:>8.3f} {p99:>8.3f} {hits:>11} {100 * moved:>6.0f}%")
+        if mode == "moving" and p99 > budget:
+            failed = True
+            print(f"  {mode}: p99 over the {budget:.2f} ms frame budget")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Respawn benchmark: in-place restore from the load-time snapshot vs rebuilding the level.
+
+First checks that both give identical play: the same seeded inputs (with
+R presses and natural deaths) run on a restoring game and on one that
+re-creates every entity on reset, comparing all entity state every frame.
+Then times one respawn each way per level (all props taken beforehand, so
+the groups have to be refilled) and reports the peak bytes allocated during
+one, the bytes resets kept allocated past the first WARMUP and the GC
+collections triggered (rebuild/restore). A restore's peak is loop
+temporaries, plus, every few dozen resets, pygame compacting a group's dict
+when props are re-added (~18 KiB for the 206-sprite "stress" group).
+The "chase" row is lv5 with its enemies chasing, "stress" is lv5 with 200
+extra patrols, which puts the EnemyManager arrays in play.
+Exits non-zero if play differs, or if a restore leaves memory allocated or
+triggers a collection once warmed up.
+Usage: python tools/bench_reset.py [--frames 3000] [--resets 500]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np
+from core.game import Game, init_headless
+from core.inputs import RIGHT, JUMP, RESET
+from sprites.enemy import CHASE
+from common import random_inputs, stress_entries
+
+WARMUP = 50  # Measured resets that set the memory high-water mark
+
+
+class Discard(io.TextIOBase):
+    """stdout sink that keeps nothing (a StringIO would grow during the measurement)."""
+
+    def write(self, s):
+        return len(s)
+
+
+def rebuild(game):
+    """Make `game` reset the way it used to: new sprites for everything."""
+    game._restore = lambda state: game._spawn()
+
+
+def load(lv, variant=None):
+    game = Game()
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.load_level(lv)
+        enemies = game.level_data.enemies
+        if variant == "chase":
+            enemies = tuple(e._replace(behavior=CHASE) for e in enemies)
+        elif variant == "stress":
+            enemies += tuple(stress_entries(game.map_handler, 200, random.Random(0)))
+        if variant:
+            game.level_data = game.level_data._replace(enemies=enemies)
+            game._spawn()
+            game.spawn_state = game._snapshot()
+            game.reset()
+    return game
+
+
+def state(game):
+    p = game.player
+    return (
+        (p.pos.x, p.pos.y, p.vel.x, p.vel.y, tuple(p.rect), p.frame_index, p.facing_right,
+         p.on_ground, p.is_dead, p.effect, p.image),
+        [(e.pos.x, e.pos.y, e.vel.x, e.vel.y, tuple(e.rect), e.direction, e.flash_timer,
+          e.frame_index, e.state, e.image, e.is_dead) for e in game.enemies],
+        [(tuple(s.rect), type(s).__name__) for s in game.all_sprites],
+        (game.shield_timer, game.torch_timer, game.has_anti_explosion, game.lv_cleared,
+         game.current_radius, game.death_count),
+    )
+
+
+def inputs(frames, seed):
+    """Random play with R pressed every 400 frames."""
+    for frame, mask in enumerate(random_inputs(frames, random.Random(seed))):
+        yield mask | (RESET if frame % 400 == 399 else 0)
+
+
+def check(lv, frames, variant=None):
+    """Play both games side by side. Returns the first frame they differ on, or None."""
+    pooled, fresh = load(lv, variant), load(lv, variant)
+    rebuild(fresh)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame, mask in enumerate(inputs(frames, lv)):
+            for game in (pooled, fresh):
+                game.step(mask)
+                if game.lv_cleared:
+                    game.reset()
+            if state(pooled) != state(fresh):
+                return frame
+    return None
+
+
+def measure(game, resets):
+    """After the warm-up: per-reset wall time (µs), peak bytes allocated during
+    one, bytes resets left allocated and GC collections."""
+    times = np.empty(resets)
+    kept = np.empty(resets)  # Bytes still allocated after a reset that follows a reset
+    peak = 0
+    collections = 0
+    timing = False
+
+    def count(phase, info):
+        nonlocal collections
+        collections += timing and phase == "start"
+
+    def take_props():
+        for prop in game.props_group.sprites():
+            prop.kill()
+
+    with contextlib.redirect_stdout(Discard()):
+        for _ in range(3):
+            game.reset()  # Warm up
+        gc.callbacks.append(count)
+        tracemalloc.start()
+        try:
+            for i in range(resets):
+                game.step(RIGHT | JUMP)
+                take_props()
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                timing = i >= WARMUP
+                start = time.perf_counter()
+                game.reset()
+                times[i] = (time.perf_counter() - start) * 1e6
+                if timing:
+                    peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+                # Again with nothing the step made for it to free: what it keeps shows
+                take_props()
+                base = tracemalloc.get_traced_memory()[0]
+                game.reset()
+                kept[i] = tracemalloc.get_traced_memory()[0] - base
+                timing = False
+        finally:
+            tracemalloc.stop()
+            gc.callbacks.remove(count)
+    # Re-adding props makes pygame's group dicts compact now and then, which
+    # swings memory within the warm-up's range; anything kept piles up above it
+    kept = np.cumsum(kept)
+    left = max(0, kept[WARMUP:].max() - kept[:WARMUP].max())
+    return times[WARMUP:], peak, left, collections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--resets", type=int, default=500)
+    args = parser.parse_args()
+    if args.resets <= WARMUP:
+        parser.error(f"--resets must be over the {WARMUP}-reset warm-up")
+
+    init_headless()
+    cases = [(f"lv{lv}", lv, None) for lv in range(1, 6)] + [("chase", 5, "chase"), ("stress", 5, "stress")]
+
+    failed = False
+    for name, lv, variant in cases:
+        bad = check(lv, args.frames, variant)
+        failed |= bad is not None
+        print(f"{name}: {args.frames} frames " + ("identical" if bad is None else f"MISMATCH at frame {bad}"))
+
+    print()
+    print(f"{'level':<7} {'sprites':>7} {'rebuild µs':>11} {'restore µs':>11} {'speedup':>8} "
+          f"{'rebuild KiB':>12} {'restore KiB':>12} {'left B':>7} {'GCs':>9}")
+    for name, lv, variant in cases:
+        results = []
+        for pooled in (False, True):
+            game = load(lv, variant)
+            if not pooled:
+                rebuild(game)
+            results.append(measure(game, args.resets))
+        (old, old_peak, _, old_gc), (new, new_peak, new_left, new_gc) = results
+        old_p50, new_p50 = np.median(old), np.median(new)
+        print(f"{name:<7} {len(game.all_sprites):>7} {old_p50:>11.1f} {new_p50:>11.1f} "
+              f"{old_p50 / new_p50:>7.1f}x {old_peak / 1024:>12.1f} {new_peak / 1024:>12.1f} "
+              f"{new_left:>7.0f} {old_gc:>4}/{new_gc:<4}")
+        if new_left or new_gc:
+            failed = True
+            print(f"  {name}: restore allocates in steady state")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Helpers shared by the benchmark and soak tools (imported from the tools directory)."""
+from core.inputs import LEFT, RIGHT, JUMP
+from core.level_data import EnemySpec
+
+CHOICES = [0, LEFT, RIGHT, JUMP, LEFT | JUMP, RIGHT | JUMP]
+
+
+def random_inputs(frames, rng):
+    """Input masks for `frames` frames: a random choice from CHOICES, held for 15 frames."""
+    mask = 0
+    for frame in range(frames):
+        if frame % 15 == 0:
+            mask = rng.choice(CHOICES)
+        yield mask
+
+
+def stress_entries(tiled_map, count, rng):
+    """`count` patrol specs dropped above random walls."""
+    walls = [w for w in tiled_map.walls if w.width >= 64 and w.top > 32]
+    entries = []
+    for _ in range(count):
+        w = rng.choice(walls)
+        x = rng.randrange(w.left, w.right - 32)
+        entries.append(EnemySpec((x, w.top - 64), rng.randrange(32, 256), rng.choice([1, 2, 3])))
+    return entries
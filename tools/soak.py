@@ -0,0 +1,44 @@
+"""Headless soak test: steps every level with random inputs, no rendering.
+
+Usage: python tools/soak.py [--frames N] [--seed S] [levels...]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from core.game import Game, init_headless
+from common import random_inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("levels", nargs="*", type=int, default=[1, 2, 3, 4, 5])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    init_headless()
+    rng = random.Random(args.seed)
+
+    for lv in args.levels:
+        game = Game()
+        if not game.load_level(lv):
+            sys.exit(1)
+        start = time.perf_counter()
+        for inputs in random_inputs(args.frames, rng):
+            game.step(inputs)
+            if game.lv_cleared:
+                game.reset()
+        elapsed = time.perf_counter() - start
+        print(f"lv{lv}: {args.frames} frames in {elapsed:.2f}s "
+              f"({args.frames / elapsed:.0f} fps), deaths={game.death_count}")
+
+
+if __name__ == "__main__":
+    main()
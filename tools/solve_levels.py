@@ -0,0 +1,415 @@
+"""Level reachability solver: proves each level can be beaten (or that it cannot).
+
+Searches the player's own physics headless: the real Player (input, move,
+walls, hazards, bouncers) stepped frame by frame in the game's phase order,
+with the props (jump boost, anti-explosion, shield), the destination from
+lvsetting.json and the enemies, run by the real Enemy code: patrols on
+their own clock, chasers (which follow the player) stepped along with each
+search state. Every search node holds one input mask for --hold frames.
+States are deduplicated on a grid of (position, vertical speed, on_ground,
+props taken, shield time), so "exhausted" means no unvisited cell is left
+at that resolution (enemies are not part of the grid: a cell counts as
+visited with the patrol timing and chaser positions it was first reached
+with). A plan is simulated with the real enemy dynamics all along, so the
+full-Game replay of a win sees the same enemies. Batches of the most
+promising nodes (fewest free-space steps from the destination) are
+expanded in parallel by a process pool.
+
+A winning input sequence is replayed through the full Game as a check and
+can be saved as a recording for `main.py --replay`.
+
+Exit status: 0 all levels beatable, 1 a level is unbeatable or blocked,
+2 the state budget ran out first. Suitable as a pre-commit check:
+    python tools/solve_levels.py
+Usage: python tools/solve_levels.py [levels...] [--workers N] [--save DIR]
+"""
+import argparse
+import contextlib
+import heapq
+import io
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from settings import FPS, ENEMY_STEPS_PER_FRAME
+from core.inputs import LEFT, RIGHT, JUMP
+
+MOVES = (RIGHT, LEFT, 0)  # Each also tried with JUMP held
+SHIELD_FRAMES = 5 * FPS  # As in Game._resolve_collisions
+BOOST_SPEED = -12.0
+
+# Outcomes of one expanded action
+DEAD, WON, MOVED = 0, 1, 2
+
+GRID = 16  # Free-space distance map cell (pixels)
+
+_levels = {}  # Worker-side level simulators, loaded on first use
+
+
+class LevelSim:
+    """One level's player, walls, triggers and chasers, stepped like Game.step.
+
+    A state is (frame, pos.x, pos.y, vel.y, on_ground, props taken bitmask,
+    shield frames left, anti-explosion held, chaser states); vel.x is
+    rewritten from the input every frame.
+    """
+
+    def __init__(self, lv_num):
+        from core.game import init_headless
+        from core.maploader import TiledMap
+        from core import level_data
+        from core.preloader import level_file
+        from sprites.player import Player
+        from sprites.prop import Prop
+        from sprites.dest import Destination
+        from sprites.enemy import Enemy, EnemyManager, CHASE
+
+        init_headless()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.map = TiledMap(level_file(lv_num))
+        lv = level_data.get(f"lv{lv_num}")
+        spawn = lv.player_spawn
+        self.player = Player(spawn[0], spawn[1])
+        self.props = [Prop(p.pos[0], p.pos[1], p.type) for p in lv.props]
+        dest = lv.destination
+        self.goal = Destination(dest[0], dest[1]).rect if dest else None
+        self.floor = self.map.height + 64  # Falling past this never comes back
+
+        # Patrols never react to the player (a hit only flashes them): record their rects per frame.
+        # Chasers follow it, so their state travels with every search state instead.
+        self.enemies, self.chasers = [], []
+        for e in lv.enemies:
+            enemy = Enemy(e.start_pos[0], e.start_pos[1], e.move_range, e.speed, e.behavior)
+            if e.behavior == CHASE:
+                enemy.chase(self.map.nav_graph(e.speed), self.player.rect)  # As in Game._spawn
+                self.chasers.append(enemy)
+            else:
+                self.enemies.append(enemy)
+        self.enemy_manager = EnemyManager(self.enemies)
+        self.enemy_rects = [[e.rect.copy() for e in self.enemies]]
+        self.spawn = (0, float(spawn[0]), float(spawn[1]), 0.0, False, 0, 0, False,
+                      tuple(chaser_state(e) for e in self.chasers))
+        if self.goal:
+            self.distances = self._distance_map()
+
+    def _distance_map(self):
+        """Steps from each GRID cell to the destination through cells whose centre is not in a wall."""
+        cols, rows = -(-self.map.width // GRID), -(-self.map.height // GRID)
+        walls = self.map.wall_index
+
+        def is_free(c, r):
+            cell = pygame.Rect(c * GRID, r * GRID, GRID, GRID)
+            return not any(w.collidepoint(cell.center) for w in walls.query(cell))
+
+        free = [[is_free(c, r) for c in range(cols)] for r in range(rows)]
+        dist = [[math.inf] * cols for _ in range(rows)]
+        queue = deque()
+        for r in range(max(0, self.goal.top // GRID), min(rows, -(-self.goal.bottom // GRID))):
+            for c in range(max(0, self.goal.left // GRID), min(cols, -(-self.goal.right // GRID))):
+                dist[r][c] = 0
+                queue.append((r, c))
+        while queue:
+            r, c = queue.popleft()
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and free[nr][nc] and dist[nr][nc] == math.inf:
+                    dist[nr][nc] = dist[r][c] + 1
+                    queue.append((nr, nc))
+        return dist
+
+    def distance(self, state):
+        """Search priority: fewest free-space steps to the destination from any cell the player covers.
+
+        Only orders the search (inf = explored last), never prunes it.
+        """
+        w, h = self.player.rect.size
+        x, y = int(state[1]), int(state[2])
+        rows = self.distances[max(0, y // GRID):max(0, (y + h - 1) // GRID + 1)]
+        c0, c1 = max(0, x // GRID), max(0, (x + w - 1) // GRID + 1)
+        return min((d for row in rows for d in row[c0:c1]), default=math.inf)
+
+    def enemies_at(self, frame):
+        """Enemy rects after the enemy updates of `frame`."""
+        rects = self.enemy_rects
+        while len(rects) <= frame:
+            for _ in range(ENEMY_STEPS_PER_FRAME):
+                self.enemy_manager.update(self.map.wall_index)
+            rects.append([e.rect.copy() for e in self.enemies])
+        return rects[frame]
+
+    def advance(self, state, inputs, frames):
+        """Hold `inputs` for `frames` frames. Returns (outcome, new state, grounded).
+
+        grounded: whether the player stood on the ground at the start of any
+        frame; if not, holding JUMP as well would have changed nothing.
+        """
+        frame, x, y, vy, on_ground, taken, shield, anti, chasers = state
+        for chaser, saved in zip(self.chasers, chasers):
+            set_chaser(chaser, saved)
+        player = self.player
+        player.pos.update(x, y)
+        player.rect.topleft = (round(x), round(y))
+        player.vel.update(0, vy)
+        player.on_ground = on_ground
+        player.is_dead = False
+        walls, hazards, bouncers = self.map.wall_index, self.map.hazard_index, self.map.bouncer_index
+        rect = player.rect
+        grounded = False
+        for _ in range(frames):
+            grounded |= player.on_ground
+            frame += 1
+            if shield > 0:
+                shield -= 1
+            player._get_input(inputs)
+            player.move(walls)
+            for _ in range(ENEMY_STEPS_PER_FRAME):
+                for chaser in self.chasers:
+                    chaser.update(walls)
+            player.check_world(hazards, bouncers, shield)
+            if player.is_dead or rect.top > self.floor:
+                return DEAD, None, grounded
+            # Triggers, in Game._resolve_collisions order
+            won = rect.colliderect(self.goal)
+            for i, prop in enumerate(self.props):
+                if not taken & (1 << i) and rect.colliderect(prop.rect):
+                    taken |= 1 << i
+                    if prop.prop_type == 1:
+                        player.vel.y = BOOST_SPEED
+                    elif prop.prop_type == 2:
+                        anti = True
+                    elif prop.prop_type == 3:
+                        shield = SHIELD_FRAMES
+            hits = [e for e in self.enemies_at(frame) if rect.colliderect(e)]
+            hits += [c for c in self.chasers if rect.colliderect(c.rect)]
+            if hits:
+                should_die = True
+                for _ in hits:
+                    if shield > 0 or anti:
+                        anti = False
+                        should_die = False
+                if should_die:
+                    return DEAD, None, grounded
+            if won:
+                return WON, None, grounded
+        state = (frame, player.pos.x, player.pos.y, player.vel.y, player.on_ground, taken, shield, anti,
+                 tuple(chaser_state(c) for c in self.chasers))
+        return MOVED, state, grounded
+
+
+def chaser_state(enemy):
+    """What steers a chasing Enemy, as plain values (states cross process boundaries)."""
+    return (enemy.pos.x, enemy.pos.y, enemy.vel.x, enemy.vel.y, enemy.rect.x, enemy.rect.y,
+            enemy.direction, enemy.target_node, enemy.plan)
+
+
+def set_chaser(enemy, state):
+    (enemy.pos.x, enemy.pos.y, enemy.vel.x, enemy.vel.y, enemy.rect.x, enemy.rect.y,
+     enemy.direction, enemy.target_node, enemy.plan) = state
+    # A path is a function of its plan (and cached by the graph)
+    enemy.path = None if enemy.plan is None else enemy.nav.path(*enemy.plan)
+
+
+def _level(lv_num):
+    if lv_num not in _levels:
+        _levels[lv_num] = LevelSim(lv_num)
+    return _levels[lv_num]
+
+
+def start_state(lv_num):
+    sim = _level(lv_num)
+    if sim.goal is None:
+        return None, 0.0
+    return sim.spawn, sim.distance(sim.spawn)
+
+
+def expand(lv_num, nodes, hold):
+    """Children of (node id, state) pairs: (parent id, action, outcome, state, distance)."""
+    sim = _level(lv_num)
+    out = []
+    for node_id, state in nodes:
+        for move in MOVES:
+            action = move
+            while action is not None:
+                outcome, child, grounded = sim.advance(state, action, hold)
+                if outcome != DEAD:
+                    out.append((node_id, action, outcome, child, sim.distance(child) if child else 0.0))
+                # The JUMP variant only differs if a jump could start during the hold
+                action = action | JUMP if grounded and not action & JUMP else None
+    return out
+
+
+def verify(lv_num, inputs):
+    """Replay through the full Game. Returns (cleared, deaths, frames used)."""
+    from core.game import Game, init_headless
+    init_headless()
+    game = Game()
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.load_level(lv_num)
+        for frame, mask in enumerate(inputs):
+            game.step(mask)
+            if game.lv_cleared:
+                return True, game.death_count, frame + 1
+    return False, game.death_count, len(inputs)
+
+
+class Search:
+    """Best-first search state for one level (lives in the main process).
+
+    When the grid is exhausted, the search restarts on a grid half as coarse
+    (up to `refine` times) before the level is reported as unbeatable.
+    """
+
+    def __init__(self, lv_num, args):
+        self.lv_num = lv_num
+        self.cell = args.cell
+        self.speed_step = args.speed_step
+        self.shield_step = args.shield_step
+        self.budget = args.budget
+        self.refine = args.refine
+        self.result = None  # "won" / "exhausted" / "budget" / "no destination"
+        self.inputs = None
+        self.states = 0  # Visited over every grid tried
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def begin(self, state, distance):
+        self.origin = (state, distance)
+        self.nodes = []  # (parent id, action) per node
+        self.visited = set()
+        self.frontier = []
+        self.push(None, None, state, distance)
+
+    def key(self, state):
+        _, x, y, vy, on_ground, taken, shield, anti, _ = state
+        return (int(x // self.cell), int(y // self.cell), round(vy / self.speed_step), on_ground, taken,
+                -(-shield // self.shield_step), anti)
+
+    def push(self, parent, action, state, distance):
+        key = self.key(state)
+        if key in self.visited:
+            return
+        self.visited.add(key)
+        self.states += 1
+        self.nodes.append((parent, action))
+        node_id = len(self.nodes) - 1
+        heapq.heappush(self.frontier, (distance, node_id, state))
+
+    def take(self, count):
+        return [(node_id, state) for _, node_id, state in
+                (heapq.heappop(self.frontier) for _ in range(min(count, len(self.frontier))))]
+
+    def path(self, node_id, last_action):
+        actions = [last_action]
+        while node_id is not None:
+            parent, action = self.nodes[node_id]
+            if action is not None:
+                actions.append(action)
+            node_id = parent
+        return actions[::-1]
+
+    def merge(self, children, hold):
+        for parent, action, outcome, state, distance in children:
+            if outcome == WON:
+                self.finish("won")
+                self.inputs = [mask for a in self.path(parent, action) for mask in [a] * hold]
+                return
+            self.push(parent, action, state, distance)
+        if not self.frontier and self.refine:
+            self.refine -= 1
+            self.cell /= 2
+            self.speed_step /= 2
+            self.begin(*self.origin)
+        elif not self.frontier:
+            self.finish("exhausted")
+        elif self.states >= self.budget:
+            self.finish("budget")
+
+    def finish(self, result):
+        self.result = result
+        self.elapsed = time.perf_counter() - self.start
+
+
+def split(items, parts):
+    size = -(-len(items) // parts)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("levels", nargs="*", type=int, default=[1, 2, 3, 4, 5])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--hold", type=int, default=6, help="frames each input is held (default 6)")
+    parser.add_argument("--cell", type=float, default=8.0, help="position grid for visited states (px)")
+    parser.add_argument("--speed-step", type=float, default=2.0, help="vertical speed grid (px/frame)")
+    parser.add_argument("--refine", type=int, default=1, help="finer grids to try before giving up")
+    parser.add_argument("--shield-step", type=int, default=FPS, help="shield time grid (frames)")
+    parser.add_argument("--batch", type=int, default=64, help="nodes expanded per worker per round")
+    parser.add_argument("--budget", type=int, default=500000, help="max visited states per level")
+    parser.add_argument("--save", metavar="DIR", help="write winning runs as DIR/lvN.rec recordings")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        searches = {}
+        for lv, (state, distance) in zip(args.levels, pool.map(start_state, args.levels)):
+            search = searches[lv] = Search(lv, args)
+            if state is None:
+                search.finish("no destination")
+            else:
+                search.begin(state, distance)
+
+        # Rounds: every unfinished level hands its best nodes to the pool at once
+        while any(s.result is None for s in searches.values()):
+            jobs = []
+            for search in searches.values():
+                if search.result is None:
+                    batch = search.take(args.batch * args.workers)
+                    jobs += [(search, pool.submit(expand, search.lv_num, part, args.hold))
+                             for part in split(batch, args.workers)]
+            for search, job in jobs:
+                children = job.result()
+                if search.result is None:
+                    search.merge(children, args.hold)
+
+        won = [s for s in searches.values() if s.result == "won"]
+        checks = dict(zip((s.lv_num for s in won), pool.map(verify, [s.lv_num for s in won],
+                                                            [s.inputs for s in won])))
+
+    status = 0
+    for lv, search in searches.items():
+        line = (f"lv{lv}: {search.result:<10} {search.states:>7} states  {search.elapsed:6.2f}s"
+                f"  (grid {search.cell:g} px, {search.speed_step:g} px/frame)")
+        if search.result == "won":
+            cleared, deaths, frames = checks[lv]
+            line += f"  {len(search.inputs)} frames"
+            if cleared:
+                line += ", replay verified"
+                if args.save:
+                    from core.replay import InputRecorder
+                    os.makedirs(args.save, exist_ok=True)
+                    recorder = InputRecorder(f"lv{lv}")
+                    for mask in search.inputs[:frames]:
+                        recorder.record(mask)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        recorder.save(os.path.join(args.save, f"lv{lv}.rec"))
+            else:
+                line += f", blocked by enemies in the full game ({deaths} deaths)"
+                status = max(status, 1)
+        elif search.result == "budget":
+            status = max(status, 2)
+        else:
+            status = max(status, 1)
+        print(line)
+    print(f"total {time.perf_counter() - start:.2f}s on {args.workers} workers")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()